@@ -15,9 +15,11 @@ from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.auth.password_hasher import PasswordHasher
+from app.auth.user_cache import cache_user
+from app.auth.user_cache import get_cached_user
 from app.db.database import get_db
 from app.models.user import User as UserModel
-from app.schemas.user_schema import TokenData
 
 _secret_key = os.getenv("SECRET_KEY")
 if not _secret_key:
@@ -27,7 +29,20 @@ SECRET_KEY: str = _secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# "lookup" (default): tokens carry only the email and every request loads the
+# user. "claims": tokens also carry id/active/superuser and are short-lived,
+# so get_current_active_user authorizes without touching the database and
+# deactivation takes effect when the client next refreshes.
+AUTH_TOKEN_MODE = os.getenv("AUTH_TOKEN_MODE", "lookup")
+CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES = int(
+    os.getenv("CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES", "5")
+)
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(
+    pwd_context, max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
@@ -41,6 +56,16 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password off the event loop"""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password off the event loop"""
+    return await password_hasher.hash(password)
+
+
 def create_access_token(
     data: dict[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -53,38 +78,123 @@ def create_access_token(
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-) -> UserModel:
-    """Decode JWT token and return the authenticated user"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+def create_refresh_token(user: UserModel) -> str:
+    """Create a long-lived token that can only be exchanged at /auth/refresh"""
+    return create_access_token(
+        data={"sub": user.email, "type": "refresh"},
+        expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
     )
+
+
+def create_user_tokens(user: UserModel) -> dict[str, str]:
+    """Create the access/refresh token pair returned on login and refresh"""
+    if AUTH_TOKEN_MODE == "claims":
+        access_token = create_access_token(
+            data={
+                "sub": user.email,
+                "uid": user.id,
+                "active": user.is_active,
+                "su": user.is_superuser,
+            },
+            expires_delta=timedelta(minutes=CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
+    else:
+        access_token = create_access_token(data={"sub": user.email})
+    return {
+        "access_token": access_token,
+        "refresh_token": create_refresh_token(user),
+        "token_type": "bearer",
+    }
+
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def decode_token(token: str, token_type: str = "access") -> dict[str, Any]:
+    """Decode a JWT and check its type; tokens without a type are access tokens"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")
-        if not isinstance(email, str):
-            raise credentials_exception
-        token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-
-    result = await db.execute(
-        select(UserModel).where(UserModel.email == token_data.email)
+    if payload.get("type", "access") != token_type:
+        raise credentials_exception
+    if not isinstance(payload.get("sub"), str):
+        raise credentials_exception
+    return payload
+
+
+def user_from_claims(payload: dict[str, Any]) -> Optional[UserModel]:
+    """Build a detached user from claims-mode tokens, None for other tokens"""
+    user_id = payload.get("uid")
+    if not isinstance(user_id, int):
+        return None
+    return UserModel(
+        id=user_id,
+        email=payload["sub"],
+        is_active=bool(payload.get("active")),
+        is_superuser=bool(payload.get("su")),
     )
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db, scope="function"),
+) -> UserModel:
+    """Decode JWT token and return the authenticated user"""
+    email: str = decode_token(token)["sub"]
+
+    # Hot path: no query when the user was seen recently
+    cached_user = await get_cached_user(email)
+    if cached_user is not None:
+        return cached_user
+
+    result = await db.execute(select(UserModel).where(UserModel.email == email))
     user = result.scalars().first()
     if user is None:
         raise credentials_exception
 
+    await cache_user(email, user)
     return user
 
 
 async def get_current_active_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db, scope="function"),
+) -> UserModel:
+    """
+    Ensure the current user is active.
+    In claims mode the user is built from the token alone; it only has
+    id, email, is_active and is_superuser set.
+    """
+    current_user = None
+    if AUTH_TOKEN_MODE == "claims":
+        current_user = user_from_claims(decode_token(token))
+    if current_user is None:
+        current_user = await get_current_user(token=token, db=db)
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
+async def get_current_active_db_user(
     current_user: UserModel = Depends(get_current_user),
 ) -> UserModel:
-    """Ensure the current user is active"""
+    """Like get_current_active_user, but always returns the full user row"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def get_current_active_superuser(
+    current_user: UserModel = Depends(get_current_active_user),
+) -> UserModel:
+    """Ensure the current user is an active admin"""
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough privileges"
+        )
+    return current_user
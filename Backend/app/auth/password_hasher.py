@@ -0,0 +1,68 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import TypeVar
+
+from passlib.context import CryptContext
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a bounded thread pool so hashing never blocks the event loop.
+    bcrypt releases the GIL, so threads give real parallelism here.
+    At most `max_workers` operations run at once; the rest wait on a semaphore
+    and the time spent waiting is recorded as queue time.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int) -> None:
+        self._context = context
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self.max_workers = max_workers
+        self.waiting = 0
+        self.completed = 0
+        self.total_queue_time = 0.0
+        self.max_queue_time = 0.0
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            queue_time = time.perf_counter() - queued_at
+            self.total_queue_time += queue_time
+            self.max_queue_time = max(self.max_queue_time, queue_time)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.completed += 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self._context.verify, plain_password, hashed_password)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "avg_queue_ms": (
+                self.total_queue_time / self.completed * 1000 if self.completed else 0.0
+            ),
+            "max_queue_ms": self.max_queue_time * 1000,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,75 @@
+import os
+from typing import Any
+from typing import Optional
+from typing import Protocol
+
+from app.models.user import User as UserModel
+from app.utils.cache import TTLCache
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "60"))  # seconds
+
+# Never put the password hash in the cache, especially not in a shared backend.
+_CACHED_COLUMNS = [
+    column.key
+    for column in UserModel.__table__.columns
+    if column.key != "hashed_password"
+]
+
+
+class UserCacheBackend(Protocol):
+    """
+    Storage for authenticated user snapshots, keyed by the token subject.
+    The default backend is per-process; plug in a shared one (e.g. Redis) so
+    invalidations reach every worker immediately instead of after the TTL.
+    """
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]: ...
+
+    async def set(self, key: str, value: dict[str, Any]) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class InMemoryUserCacheBackend:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.cache: TTLCache[str, dict[str, Any]] = TTLCache(maxsize, ttl)
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        self.cache.set(key, value)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+
+_backend: UserCacheBackend = InMemoryUserCacheBackend(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+
+def set_user_cache_backend(backend: UserCacheBackend) -> None:
+    global _backend
+    _backend = backend
+
+
+async def get_cached_user(subject: str) -> Optional[UserModel]:
+    """
+    Return a detached copy of the cached user, or None on a miss.
+    """
+    data = await _backend.get(subject)
+    if data is None:
+        return None
+    return UserModel(**data)
+
+
+async def cache_user(subject: str, user: UserModel) -> None:
+    await _backend.set(subject, {key: getattr(user, key) for key in _CACHED_COLUMNS})
+
+
+async def invalidate_user(*subjects: str) -> None:
+    """
+    Drop cached users, e.g. after their row was updated or deleted.
+    """
+    for subject in subjects:
+        await _backend.delete(subject)
@@ -1,26 +1,323 @@
+import asyncio
+import itertools
 import os
 from collections.abc import AsyncGenerator
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import Any
+from typing import Literal
 
+from sqlalchemy import Connection
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.pool import ConnectionPoolEntry
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL environment variable is not set.")
 
-engine = create_async_engine(DATABASE_URL, future=True, echo=True)
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_echo(name: str) -> bool | Literal["debug"]:
+    """Statement logging: "false" (default), "true" (SQL only) or "debug"."""
+    value = (os.getenv(name) or "").strip().lower()
+    if value == "debug":
+        return "debug"
+    return value in ("1", "true", "yes", "on")
+
+
+# Pool sizing should be checked against the uvicorn worker count: every worker
+# process owns its own pool, so the database sees
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections at peak.
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)  # seconds to wait for a connection
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)  # seconds, -1 disables
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+DB_ECHO = _env_echo("DB_ECHO")
+DB_POOL_METRICS_INTERVAL = _env_int("DB_POOL_METRICS_INTERVAL", 0)  # 0 disables
+
+# Comma-separated replica URLs; reads fall back to the primary when empty.
+DATABASE_READ_URLS = [
+    url.strip() for url in os.getenv("DATABASE_READ_URLS", "").split(",") if url.strip()
+]
+DB_REPLICA_MAX_LAG = _env_int("DB_REPLICA_MAX_LAG", 5)  # seconds
+DB_REPLICA_CHECK_INTERVAL = _env_int("DB_REPLICA_CHECK_INTERVAL", 5)  # seconds
+
+# Needed by indexes declared on the models (pg_trgm for whiskey name search)
+POSTGRES_EXTENSIONS = ("pg_trgm",)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that also tracks how many callers are blocked in checkout.
+    SQLAlchemy only exposes checked-in/out and overflow counts.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self.peak_waiting = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        # A max_overflow of -1 means unlimited overflow: checkout never waits
+        exhausted = (
+            self.checkedin() == 0
+            and self._max_overflow > -1
+            and self.overflow() >= self._max_overflow
+        )
+        if not exhausted:
+            return super()._do_get()
+
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            return super()._do_get()
+        finally:
+            self.waiting -= 1
+
+
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        future=True,
+        echo=DB_ECHO,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+
+engine = create_engine_from_settings(DATABASE_URL)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
 Base = declarative_base()
 
 
+class ReadReplica:
+    """
+    A read-only replica with its own pool and last observed replication lag.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.engine = create_engine_from_settings(url)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.healthy = True
+        self.lag: float | None = None
+
+
+read_replicas = [ReadReplica(url) for url in DATABASE_READ_URLS]
+_replica_counter = itertools.count()
+
+# Zero when the replica has replayed everything it received, otherwise the age
+# of the last replayed transaction (an idle primary would look "lagging").
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def _create_extensions(sync_conn: Connection) -> None:
+    """
+    Best effort: without the privilege to create an extension, startup goes on
+    and only the indexes depending on it fail to build.
+    """
+    if sync_conn.dialect.name != "postgresql":
+        return
+    for extension in POSTGRES_EXTENSIONS:
+        try:
+            with sync_conn.begin_nested():
+                sync_conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+        except SQLAlchemyError as e:
+            print(f"Could not create extension {extension}: {e}")
+
+
+def extension_installed(extension: str) -> Callable[..., bool]:
+    """
+    DDL condition for schema items that need a PostgreSQL extension, so a
+    missing extension skips them instead of failing create_all.
+    """
+
+    def check(ddl: Any, target: Any, bind: Connection | None, **kw: Any) -> bool:
+        if bind is None:
+            return False
+        found = bind.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = :name"),
+            {"name": extension},
+        )
+        return found.first() is not None
+
+    return check
+
+
+def _create_missing_indexes(sync_conn: Connection) -> None:
+    """
+    create_all skips tables that already exist, so indexes added to existing
+    models would never be built. Create them here, each in a savepoint so one
+    failure (e.g. duplicates blocking a unique index) doesn't abort startup.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with sync_conn.begin_nested():
+                    index.create(sync_conn, checkfirst=True)
+            except SQLAlchemyError as e:
+                print(f"Could not create index {index.name}: {e}")
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
+        await conn.run_sync(_create_extensions)
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Request-scoped unit of work: services only flush, the request commits once
+    on success and rolls back if the handler raised.
+    Routes must depend on it with scope="function", so the commit runs before
+    the response is sent and a failed commit is reported as a 500 instead of
+    being lost after a success response.
+    """
     async with async_session() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        else:
+            if session.in_transaction():
+                await session.commit()
+            for callback in session.info.pop("after_commit", []):
+                await callback()
+
+
+def after_commit(
+    session: AsyncSession, callback: Callable[[], Awaitable[None]]
+) -> None:
+    """
+    Run `callback` once the request's transaction has been committed, e.g.
+    to drop cache entries that a concurrent request could otherwise refill
+    from the old row. Skipped if the request fails. Only sessions from
+    get_db run these.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+def read_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Pick the next healthy replica round-robin, or the primary if none is usable.
+    """
+    healthy = [replica for replica in read_replicas if replica.healthy]
+    if not healthy:
+        return async_session
+    return healthy[next(_replica_counter) % len(healthy)].sessionmaker
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only routes. Never use it for writes or row locks.
+    Meant for lists, search and dashboards: a replica may lag up to
+    DB_REPLICA_MAX_LAG behind, so single-row lookups stay on the primary,
+    where a client always finds the row it just created or changed.
+    """
+    async with read_sessionmaker()() as session:
         yield session
+
+
+async def check_replica_lag(replica: ReadReplica) -> None:
+    try:
+        async with replica.engine.connect() as conn:
+            lag = (await conn.execute(REPLICA_LAG_QUERY)).scalar()
+    except (SQLAlchemyError, OSError) as e:
+        print(f"Read replica {replica.engine.url!r} unavailable: {e}")
+        replica.healthy = False
+        replica.lag = None
+        return
+
+    replica.lag = float(lag or 0)
+    replica.healthy = replica.lag <= DB_REPLICA_MAX_LAG
+
+
+async def monitor_replica_lag(interval: int) -> None:
+    """
+    Keep replica health current so get_read_db skips lagging replicas.
+    """
+    while True:
+        for replica in read_replicas:
+            await check_replica_lag(replica)
+        await asyncio.sleep(interval)
+
+
+def pool_status(db_engine: AsyncEngine) -> dict[str, Any]:
+    """
+    Return a snapshot of the engine's connection pool.
+    """
+    pool = db_engine.pool
+    if not isinstance(pool, InstrumentedAsyncPool):
+        return {"status": pool.status()}
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "waiting": pool.waiting,
+        "peak_waiting": pool.peak_waiting,
+    }
+
+
+def replicas_status() -> list[dict[str, Any]]:
+    return [
+        {
+            "url": replica.engine.url.render_as_string(hide_password=True),
+            "healthy": replica.healthy,
+            "lag_seconds": replica.lag,
+            "pool": pool_status(replica.engine),
+        }
+        for replica in read_replicas
+    ]
+
+
+async def log_pool_metrics(interval: int) -> None:
+    """
+    Periodically print the pool gauge, warning when callers had to wait
+    for a connection since the previous sample (pool starvation).
+    """
+    engines = [("primary", engine)] + [
+        (f"replica {i}", replica.engine) for i, replica in enumerate(read_replicas)
+    ]
+    while True:
+        await asyncio.sleep(interval)
+        for name, db_engine in engines:
+            stats = pool_status(db_engine)
+            print(f"DB pool ({name}): {stats}")
+            if stats.get("peak_waiting"):
+                print(
+                    f"DB pool warning ({name}): requests waited for a connection, "
+                    "consider raising DB_POOL_SIZE / DB_MAX_OVERFLOW."
+                )
+            if isinstance(db_engine.pool, InstrumentedAsyncPool):
+                db_engine.pool.peak_waiting = db_engine.pool.waiting
@@ -0,0 +1,240 @@
+"""
+EXPLAIN-based index audit for the per-user service queries.
+
+Runs the real service functions against a PostgreSQL database, captures the
+SQL they emit, and EXPLAINs each statement with the normal planner settings.
+Every audited call names the indexes it is expected to use; a plan that uses
+none of them (a sequential scan, or a worse index followed by a sort) fails.
+
+    python -m app.db.index_audit --seed
+
+--seed creates the schema and fills an empty database with realistically
+sized data first, so the planner's choices match production rather than a
+handful of rows. Exits with status 1 on any regression; CI runs it against a
+throwaway PostgreSQL service.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import async_session
+from app.db.database import engine
+from app.db.database import init_db
+from app.models.tasting import Tasting as TastingModel
+from app.services import tasting_service
+from app.services import user_whiskey_service
+
+SEED_USERS = 2000
+SEED_WHISKEYS = 5000
+SEED_WHISKEYS_PER_USER = 40
+SEED_TASTINGS_PER_WHISKEY = 8
+
+_SEED_STATEMENTS = (
+    """
+    INSERT INTO users (email, full_name, hashed_password, is_active, is_superuser)
+    SELECT 'audit' || u || '@example.com', 'Audit user ' || u, 'x', true, false
+    FROM generate_series(1, CAST(:users AS integer)) AS u
+    """,
+    """
+    INSERT INTO whiskeys (name, age, price, bottle_status_percent, is_favorite)
+    SELECT 'Whiskey ' || w, 3 + w % 25, 20 + w % 300, 100, false
+    FROM generate_series(1, CAST(:whiskeys AS integer)) AS w
+    """,
+    """
+    INSERT INTO user_whiskeys
+        (user_id, whiskey_id, is_owned, is_favorite, created_date)
+    SELECT u.id, (u.id * 7 + k) % CAST(:whiskeys AS integer) + 1, true, k % 5 = 0,
+           now() - make_interval(days => k)
+    FROM users AS u, generate_series(0, CAST(:per_user AS integer) - 1) AS k
+    """,
+    """
+    INSERT INTO tastings (user_id, user_whiskey_id, tasting_date, rating, shared,
+                          created_date, updated_date)
+    SELECT uw.user_id, uw.id, DATE '2020-01-01' + (uw.id * 13 + t) % 1800,
+           1 + (uw.id + t) % 10, false, current_date, current_date
+    FROM user_whiskeys AS uw, generate_series(1, CAST(:per_whiskey AS integer)) AS t
+    """,
+)
+
+
+async def seed() -> None:
+    """
+    Create the schema and fill it when it holds no tastings yet.
+    """
+    await init_db()
+    async with engine.begin() as conn:
+        if (
+            await conn.execute(select(func.count()).select_from(TastingModel))
+        ).scalar():
+            return
+        parameters = {
+            "users": SEED_USERS,
+            "whiskeys": SEED_WHISKEYS,
+            "per_user": SEED_WHISKEYS_PER_USER,
+            "per_whiskey": SEED_TASTINGS_PER_WHISKEY,
+        }
+        for statement in _SEED_STATEMENTS:
+            await conn.execute(text(statement), parameters)
+        await conn.execute(text("ANALYZE"))
+
+
+# (description, service call, indexes any of which the plan must use)
+AuditCase = tuple[str, Callable[[AsyncSession, int, int], Awaitable[Any]], set[str]]
+
+CASES: list[AuditCase] = [
+    (
+        "tastings by user, newest first",
+        lambda db, user_id, uw_id: tasting_service.get_tastings_by_user(
+            db, user_id=user_id
+        ),
+        {"ix_tastings_user_id_tasting_date"},
+    ),
+    (
+        "tastings by user, by rating",
+        lambda db, user_id, uw_id: tasting_service.get_tastings_by_user(
+            db, user_id=user_id, sort="rating"
+        ),
+        {"ix_tastings_user_id_rating"},
+    ),
+    (
+        "tastings of one bottle",
+        lambda db, user_id, uw_id: tasting_service.get_tastings_by_user_whiskey(
+            db, user_whiskey_id=uw_id, user_id=user_id
+        ),
+        {"ix_tastings_user_whiskey_id_tasting_date"},
+    ),
+    (
+        "single tasting",
+        lambda db, user_id, uw_id: tasting_service.get_tasting(
+            db, tasting_id=1, user_id=user_id
+        ),
+        {"tastings_pkey", "ix_tastings_id"},
+    ),
+    (
+        "collection, newest first",
+        lambda db, user_id, uw_id: user_whiskey_service.get_user_whiskeys(
+            db, user_id=user_id
+        ),
+        {"ix_user_whiskeys_user_id_created_date"},
+    ),
+    (
+        "single collection entry",
+        lambda db, user_id, uw_id: user_whiskey_service.get_user_whiskey(
+            db, user_whiskey_id=uw_id, user_id=user_id
+        ),
+        {"user_whiskeys_pkey", "ix_user_whiskeys_id"},
+    ),
+]
+
+
+def _index_names(plan: dict[str, Any]) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+async def _capture(db: AsyncSession, call: Awaitable[Any]) -> tuple[str, Any]:
+    """
+    The first statement the service call emits, i.e. its main query.
+    """
+    captured: list[tuple[str, Any]] = []
+
+    def record(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        await call
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return captured[0]
+
+
+async def audit() -> list[str]:
+    """
+    Return a report for each audited call whose plan misses its indexes.
+    """
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("The index audit needs a PostgreSQL database.")
+
+    failures = []
+    async with async_session() as db:
+        row = (
+            await db.execute(
+                select(TastingModel.user_id, TastingModel.user_whiskey_id)
+                .group_by(TastingModel.user_id, TastingModel.user_whiskey_id)
+                .order_by(func.count().desc())
+                .limit(1)
+            )
+        ).first()
+        if row is None:
+            raise SystemExit("No tastings found; run with --seed first.")
+        user_id, user_whiskey_id = row
+
+        for description, call, expected in CASES:
+            statement, parameters = await _capture(
+                db, call(db, user_id, user_whiskey_id)
+            )
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                )
+                explained = result.scalar_one()
+            if isinstance(explained, str):  # asyncpg leaves json undecoded
+                explained = json.loads(explained)
+            plan = explained[0]["Plan"]
+            used = _index_names(plan)
+            if not used & expected:
+                failures.append(
+                    f"{description}: expected one of {sorted(expected)}, "
+                    f"plan uses {sorted(used) or 'no index'}\n{statement}"
+                )
+    return failures
+
+
+async def _run(seed_first: bool) -> list[str]:
+    if seed_first:
+        await seed()
+    try:
+        return await audit()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--seed", action="store_true", help="create and fill an empty database first"
+    )
+    args = parser.parse_args()
+
+    failures = asyncio.run(_run(args.seed))
+    for failure in failures:
+        print(failure, end="\n\n")
+    if failures:
+        print(f"{len(failures)} service queries miss their expected index.")
+        sys.exit(1)
+    print(f"All {len(CASES)} audited service queries use their expected index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,18 +11,54 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app.auth.auth import password_hasher
+from app.db.database import DB_POOL_METRICS_INTERVAL
+from app.db.database import DB_REPLICA_CHECK_INTERVAL
 from app.db.database import init_db
+from app.db.database import log_pool_metrics
+from app.db.database import monitor_replica_lag
+from app.db.database import read_replicas
+from app.models.ai_cache import AICacheEntry
+from app.models.analysis_job import AnalysisJob
 from app.models.distillery import Distillery
 from app.models.tasting import Tasting
 from app.models.user import User
+from app.models.user_stats import UserStats
 from app.models.user_whiskey import UserWhiskey
 from app.models.whiskey import Whiskey
+from app.models.whiskey_rating import WhiskeyRating
+from app.routers import ai
+from app.routers import analysis
 from app.routers import auth
+from app.routers import autocomplete
+from app.routers import dashboard
 from app.routers import distilleries
+from app.routers import export
+from app.routers import health
+from app.routers import recommendations
+from app.routers import search
+from app.routers import stats
 from app.routers import tastings
+from app.routers import trending
 from app.routers import user_whiskey
 from app.routers import users
 from app.routers import whiskeys
+from app.services.ai_cache import AI_CACHE_PRUNE_INTERVAL
+from app.services.ai_cache import prune_ai_cache_periodically
+from app.services.ai_client import ai_client
+from app.services.analysis_service import analysis_queue
+from app.services.analysis_service import recover_analysis_jobs
+from app.services.autocomplete_service import AUTOCOMPLETE_REFRESH_INTERVAL
+from app.services.autocomplete_service import rebuild_index as rebuild_autocomplete
+from app.services.autocomplete_service import (
+    rebuild_index_periodically as rebuild_autocomplete_periodically,
+)
+from app.services.recommendation_service import RECOMMENDER_REBUILD_INTERVAL
+from app.services.recommendation_service import rebuild_index_periodically
+from app.services.stats_service import backfill_whiskey_ratings
+from app.services.trending_service import TRENDING_REFRESH_INTERVAL
+from app.services.trending_service import refresh_trending_periodically
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 
 @asynccontextmanager
@@ -30,7 +66,48 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     print("Application startup: Starting database table creation...")
     await init_db()
     print("Application startup: Database tables created successfully.")
+    await backfill_whiskey_ratings()
+    background_tasks: list[asyncio.Task[None]] = []
+    if DB_POOL_METRICS_INTERVAL > 0:
+        background_tasks.append(
+            asyncio.create_task(log_pool_metrics(DB_POOL_METRICS_INTERVAL))
+        )
+    if read_replicas:
+        background_tasks.append(
+            asyncio.create_task(monitor_replica_lag(DB_REPLICA_CHECK_INTERVAL))
+        )
+    if TRENDING_REFRESH_INTERVAL > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                refresh_trending_periodically(TRENDING_REFRESH_INTERVAL)
+            )
+        )
+    if AUTOCOMPLETE_REFRESH_INTERVAL > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                rebuild_autocomplete_periodically(AUTOCOMPLETE_REFRESH_INTERVAL)
+            )
+        )
+    else:
+        await rebuild_autocomplete()
+    if RECOMMENDER_REBUILD_INTERVAL > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                rebuild_index_periodically(RECOMMENDER_REBUILD_INTERVAL)
+            )
+        )
+    if AI_CACHE_PRUNE_INTERVAL > 0:
+        background_tasks.append(
+            asyncio.create_task(prune_ai_cache_periodically(AI_CACHE_PRUNE_INTERVAL))
+        )
+    analysis_queue.start()
+    await recover_analysis_jobs()
     yield
+    for task in background_tasks:
+        task.cancel()
+    await analysis_queue.stop()
+    password_hasher.shutdown()
+    await ai_client.aclose()
 
 
 app = FastAPI(
@@ -52,14 +129,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/api", tags=["Users"])
+app.include_router(search.router, prefix="/api", tags=["Search"])
+app.include_router(trending.router, prefix="/api", tags=["Search"])
+app.include_router(autocomplete.router, prefix="/api", tags=["Search"])
 app.include_router(whiskeys.router, prefix="/api", tags=["Whiskeys"])
 app.include_router(tastings.router, prefix="/api", tags=["Tastings"])
 app.include_router(distilleries.router, prefix="/api", tags=["Distilleries"])
 app.include_router(user_whiskey.router, prefix="/api", tags=["User Whiskey"])
+app.include_router(export.router, prefix="/api", tags=["Export"])
+app.include_router(recommendations.router, prefix="/api", tags=["Recommendations"])
+app.include_router(ai.router, prefix="/api", tags=["AI"])
+app.include_router(analysis.router, prefix="/api", tags=["Analysis"])
+app.include_router(stats.router, prefix="/api", tags=["Stats"])
+app.include_router(dashboard.router, prefix="/api", tags=["Dashboard"])
+app.include_router(health.router, prefix="/health", tags=["Health"])
 
 
 @app.get("/")
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON
+from sqlalchemy import DateTime
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class AICacheEntry(Base):
+    """
+    Persistent tier of the AI response cache, shared by all workers and
+    kept across restarts. Keys are "<namespace>:<normalized query>".
+    """
+
+    __tablename__ = "ai_cache"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    response: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    created_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<AICacheEntry(key='{self.key}', expires_at={self.expires_at})>"
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON
+from sqlalchemy import DateTime
+from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy import String
+from sqlalchemy import text
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class AnalysisJob(Base):
+    """
+    A collection analysis run out of band: submitted by a request, run by
+    the analysis worker pool, polled or streamed by the client.
+    Status goes pending -> running -> completed or failed.
+    """
+
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        # The user's latest jobs, and their active one
+        Index("ix_analysis_jobs_user_id_status", "user_id", "status"),
+        # At most one pending or running job per user, even when two
+        # requests submit at once
+        Index(
+            "uq_analysis_jobs_user_id_active",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+            sqlite_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    status: Mapped[str] = mapped_column(String, default="pending")
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    created_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    started_date: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_date: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<AnalysisJob(id={self.id}, status='{self.status}')>"
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 from sqlalchemy import Boolean
 from sqlalchemy import Date
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Text
@@ -20,6 +21,19 @@ if TYPE_CHECKING:
 
 class Tasting(Base):
     __tablename__ = "tastings"
+    __table_args__ = (
+        # Per-user listing ordered by date (keyset pagination on date, id)
+        Index("ix_tastings_user_id_tasting_date", "user_id", "tasting_date", "id"),
+        # Per-user listing ordered or filtered by rating
+        Index("ix_tastings_user_id_rating", "user_id", "rating", "id"),
+        # Per-bottle listing, also covers the user_whiskey_id foreign key
+        Index(
+            "ix_tastings_user_whiskey_id_tasting_date",
+            "user_whiskey_id",
+            "tasting_date",
+            "id",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
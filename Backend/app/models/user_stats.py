@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy import Float
+from sqlalchemy import ForeignKey
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class UserStats(Base):
+    """
+    Per-user dashboard rollup, kept current by the tasting and collection
+    services so reading the dashboard never scans a user's rows.
+    Tasting counters are adjusted by deltas; the collection columns are
+    recomputed for the user whenever their collection changes.
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    total_whiskeys: Mapped[int] = mapped_column(Integer, default=0)
+    unique_distilleries: Mapped[int] = mapped_column(Integer, default=0)
+    collection_value: Mapped[float] = mapped_column(Float, default=0.0)
+    total_tastings: Mapped[int] = mapped_column(Integer, default=0)
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0)
+
+    updated_date: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    @property
+    def average_rating(self) -> float | None:
+        if not self.total_tastings:
+            return None
+        return round(self.rating_sum / self.total_tastings, 1)
+
+    def __repr__(self) -> str:
+        return (
+            f"<UserStats(user_id={self.user_id}, "
+            f"total_whiskeys={self.total_whiskeys}, "
+            f"total_tastings={self.total_tastings})>"
+        )
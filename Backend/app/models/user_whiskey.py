@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import Boolean
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
@@ -23,6 +24,14 @@ class UserWhiskey(Base):
     """
 
     __tablename__ = "user_whiskeys"
+    __table_args__ = (
+        # A whiskey appears once per collection; also serves user_id lookups
+        Index(
+            "uq_user_whiskeys_user_id_whiskey_id", "user_id", "whiskey_id", unique=True
+        ),
+        Index("ix_user_whiskeys_user_id_created_date", "user_id", "created_date", "id"),
+        Index("ix_user_whiskeys_whiskey_id", "whiskey_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
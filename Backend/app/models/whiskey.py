@@ -7,6 +7,7 @@ from sqlalchemy import Date
 from sqlalchemy import DateTime
 from sqlalchemy import Float
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy.orm import Mapped
@@ -15,6 +16,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db.database import Base
+from app.db.database import extension_installed
 
 if TYPE_CHECKING:
     from app.models.distillery import Distillery
@@ -23,11 +25,24 @@ if TYPE_CHECKING:
 
 class Whiskey(Base):
     __tablename__ = "whiskeys"
+    __table_args__ = (
+        # Fuzzy and substring name search (pg_trgm), PostgreSQL only
+        Index(
+            "ix_whiskeys_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql", callable_=extension_installed("pg_trgm")),
+        # Search filters and facets
+        Index("ix_whiskeys_region", "region"),
+        Index("ix_whiskeys_type", "type"),
+        Index("ix_whiskeys_price", "price"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, index=True, nullable=False)
     distillery_id: Mapped[int | None] = mapped_column(
-        ForeignKey("distilleries.id"), nullable=True
+        ForeignKey("distilleries.id"), nullable=True, index=True
     )
     region: Mapped[str | None] = mapped_column(String, nullable=True)
     age: Mapped[int | None] = mapped_column(Integer, nullable=True)
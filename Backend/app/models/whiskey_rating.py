@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime
+from sqlalchemy import ForeignKey
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class WhiskeyRating(Base):
+    """
+    Per-whiskey tasting rollup across all users, kept current by the tasting
+    services with deltas (like UserStats) so filtering the catalog by
+    average rating never aggregates the tasting history.
+    """
+
+    __tablename__ = "whiskey_ratings"
+
+    whiskey_id: Mapped[int] = mapped_column(
+        ForeignKey("whiskeys.id", ondelete="CASCADE"), primary_key=True
+    )
+    tasting_count: Mapped[int] = mapped_column(Integer, default=0)
+    rating_sum: Mapped[int] = mapped_column(Integer, default=0)
+
+    updated_date: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    @property
+    def average_rating(self) -> float | None:
+        if not self.tasting_count:
+            return None
+        return round(self.rating_sum / self.tasting_count, 1)
+
+    def __repr__(self) -> str:
+        return (
+            f"<WhiskeyRating(whiskey_id={self.whiskey_id}, "
+            f"tasting_count={self.tasting_count})>"
+        )
@@ -0,0 +1,50 @@
+import json
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from typing import Any
+from typing import Dict
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+
+from app.auth.auth import get_current_active_user
+from app.models.user import User
+from app.services.ai_service import search_whiskey_info
+from app.services.ai_service import stream_whiskey_info
+from app.utils.sse import sse_event
+from app.utils.sse import sse_response
+
+router = APIRouter()
+
+
+@router.get("/ai/whiskey-info")
+async def read_whiskey_info(
+    query: str = Query(..., min_length=1, max_length=200),
+    current_user: User = Depends(get_current_active_user),
+) -> Dict[str, Any]:
+    """
+    AI-generated information about a whiskey or distillery, in Hebrew.
+    """
+    return await search_whiskey_info(query)
+
+
+@router.get("/ai/whiskey-info/stream")
+async def stream_whiskey_info_events(
+    query: str = Query(..., min_length=1, max_length=200),
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Same as /ai/whiskey-info as Server-Sent Events: "token" events carry
+    the text as it is generated, "field" events each extracted field as
+    soon as its line is complete, and a final "result" (or "error") event
+    the full payload. Data is JSON.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        async with aclosing(stream_whiskey_info(query)) as stream:
+            async for event, data in stream:
+                yield sse_event(event, json.dumps(data, ensure_ascii=False))
+
+    return sse_response(events())
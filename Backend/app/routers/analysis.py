@@ -0,0 +1,83 @@
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.auth import get_current_active_user
+from app.db.database import get_db
+from app.models.analysis_job import AnalysisJob as AnalysisJobModel
+from app.models.user import User
+from app.schemas.analysis_schema import AnalysisJob
+from app.services.analysis_service import get_analysis_job
+from app.services.analysis_service import submit_analysis_job
+from app.services.analysis_service import watch_analysis_job
+from app.utils.sse import sse_event
+from app.utils.sse import sse_response
+
+router = APIRouter()
+
+
+@router.post(
+    "/analysis/jobs",
+    response_model=AnalysisJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_collection_analysis(
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+) -> AnalysisJobModel:
+    """
+    Queue an AI analysis of the current user's collection and return the job
+    right away. Poll /analysis/jobs/{job_id} or stream its events for the
+    result. While a job is pending or running, the same job is returned.
+    """
+    job = await submit_analysis_job(db, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many analyses in progress, please try again later",
+            headers={"Retry-After": "30"},
+        )
+    return job
+
+
+@router.get("/analysis/jobs/{job_id}", response_model=AnalysisJob)
+async def read_analysis_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+) -> AnalysisJobModel:
+    """
+    Status of an analysis job, with its result once completed.
+    Read from the primary: a replica could lag behind the worker's update.
+    """
+    job = await get_analysis_job(db, job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return job
+
+
+@router.get("/analysis/jobs/{job_id}/events")
+async def stream_analysis_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Server-Sent Events: one "status" event per status change, carrying the
+    job, ending after the job completed or failed.
+    """
+    if await get_analysis_job(db, job_id, user_id=current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+
+    async def events() -> AsyncIterator[str]:
+        async with aclosing(watch_analysis_job(job_id, current_user.id)) as jobs:
+            async for job in jobs:
+                yield sse_event("status", AnalysisJob.from_orm(job).json())
+
+    return sse_response(events())
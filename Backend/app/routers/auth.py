@@ -5,8 +5,10 @@ from fastapi import status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.auth import create_access_token
-from app.auth.auth import get_current_active_user
+from app.auth.auth import create_user_tokens
+from app.auth.auth import credentials_exception
+from app.auth.auth import decode_token
+from app.auth.auth import get_current_active_db_user
 from app.db.database import get_db
 from app.schemas import user_schema
 from app.services.user_service import authenticate_user
@@ -19,7 +21,7 @@ router = APIRouter()
 @router.post("/token", response_model=user_schema.Token, tags=["Authentication"])
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> dict[str, str]:
     """
     Authenticate user and return JWT access token.
@@ -32,8 +34,23 @@ async def login_for_access_token(
             detail="שם משתמש או סיסמה שגויים",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
+    return create_user_tokens(user)
+
+
+@router.post("/refresh", response_model=user_schema.Token, tags=["Authentication"])
+async def refresh_access_token(
+    body: user_schema.RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db, scope="function"),
+) -> dict[str, str]:
+    """
+    Exchange a refresh token for a new access/refresh token pair.
+    The user is re-checked here, so deleted or deactivated users are cut off.
+    """
+    payload = decode_token(body.refresh_token, token_type="refresh")
+    user = await get_user_by_email(db, email=payload["sub"])
+    if user is None or not user.is_active:
+        raise credentials_exception
+    return create_user_tokens(user)
 
 
 @router.post(
@@ -43,7 +60,7 @@ async def login_for_access_token(
     tags=["Authentication"],
 )
 async def register_user(
-    user: user_schema.UserCreate, db: AsyncSession = Depends(get_db)
+    user: user_schema.UserCreate, db: AsyncSession = Depends(get_db, scope="function")
 ) -> user_schema.User:
     """
     Register a new user.
@@ -58,7 +75,7 @@ async def register_user(
 
 @router.get("/users/me", response_model=user_schema.User, tags=["Users"])
 async def read_users_me(
-    current_user: user_schema.User = Depends(get_current_active_user),
+    current_user: user_schema.User = Depends(get_current_active_db_user),
 ) -> user_schema.User:
     """
     Retrieve the current authenticated user's details.
@@ -0,0 +1,22 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi import Query
+
+from app.schemas.search_schema import Suggestion
+from app.services.autocomplete_service import AUTOCOMPLETE_MAX_RESULTS
+from app.services.autocomplete_service import autocomplete
+
+router = APIRouter()
+
+
+@router.get("/autocomplete", response_model=List[Suggestion])
+async def autocomplete_names(
+    q: str = Query(..., max_length=100),
+    limit: int = Query(10, ge=1, le=AUTOCOMPLETE_MAX_RESULTS),
+) -> List[Suggestion]:
+    """
+    Whiskey and distillery names with a word starting with `q`, most
+    collected first. Served from memory, without a database round trip.
+    """
+    return autocomplete(q, limit)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.auth import get_current_active_user
+from app.db.database import get_read_db
+from app.models.user import User
+from app.schemas.dashboard_schema import Dashboard
+from app.schemas.dashboard_schema import RecentTasting
+from app.schemas.stats_schema import UserStats
+from app.schemas.tasting_schema import Tasting
+from app.schemas.user_whiskey_schema import UserWhiskey
+from app.services.stats_service import get_user_stats
+from app.services.tasting_service import get_recent_tastings
+from app.services.user_whiskey_service import get_user_whiskeys
+
+router = APIRouter()
+
+
+@router.get("/dashboard", response_model=Dashboard)
+async def read_dashboard(
+    limit: int = 3,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Dashboard:
+    """
+    Stats, latest collection entries and latest tastings for the dashboard.
+    One request means one authentication and one pooled connection for all
+    three; the queries run back to back on it (a session cannot run
+    statements concurrently, and each one is an indexed lookup).
+    """
+    stats = await get_user_stats(db, user_id=current_user.id)
+    user_whiskeys = await get_user_whiskeys(db, user_id=current_user.id, limit=limit)
+    tastings = await get_recent_tastings(db, user_id=current_user.id, limit=limit)
+    return Dashboard(
+        stats=UserStats.from_orm(stats),
+        recent_whiskeys=[UserWhiskey.from_orm(entry) for entry in user_whiskeys],
+        recent_tastings=[
+            RecentTasting(**Tasting.from_orm(tasting).dict(), whiskey_name=name)
+            for tasting, name in tastings
+        ],
+    )
@@ -1,18 +1,25 @@
 from typing import List
+from typing import Optional
 
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Response
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.auth import get_current_active_user
 from app.db.database import get_db
+from app.db.database import get_read_db
 from app.models.distillery import Distillery as DistilleryModel
 from app.schemas.distillery_schema import Distillery as DistillerySchema
 from app.schemas.distillery_schema import DistilleryCreate
 from app.schemas.distillery_schema import DistilleryUpdate
 from app.services import distillery_service
+from app.services.distillery_service import DistillerySort
+from app.utils.pagination import SortOrder
+from app.utils.pagination import parse_cursor
+from app.utils.pagination import set_next_cursor
 
 # from app.auth.auth import get_current_active_superuser
 # ^ If some actions are admin-only
@@ -27,7 +34,7 @@ router = APIRouter()
 )
 async def create_new_distillery(
     distillery: DistilleryCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: dict = Depends(get_current_active_user),  # Protect this route
     # current_user: dict = Depends(get_current_active_superuser) # Or make it admin-only
 ) -> DistilleryModel:
@@ -47,23 +54,41 @@ async def create_new_distillery(
 
 @router.get("/distilleries/", response_model=List[DistillerySchema])
 async def read_all_distilleries(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: DistillerySort = "name",
+    order: SortOrder = "asc",
+    db: AsyncSession = Depends(get_read_db),
     # No auth needed for reading list of distilleries by default, but you can add it:
     # current_user: dict = Depends(get_current_active_user)
 ) -> List[DistilleryModel]:
     """
     Retrieve all distilleries.
     """
-    distilleries = await distillery_service.get_distilleries(db, skip=skip, limit=limit)
+    distilleries = await distillery_service.get_distilleries(
+        db,
+        skip=skip,
+        limit=limit,
+        cursor=parse_cursor(cursor, sort),
+        sort=sort,
+        descending=order == "desc",
+    )
+    set_next_cursor(
+        response,
+        distilleries,
+        limit,
+        sort,
+        distillery_service.DISTILLERY_SORT_KEYS[sort],
+    )
     return distilleries
 
 
 @router.get("/distilleries/{distillery_id}", response_model=DistillerySchema)
 async def read_single_distillery(
     distillery_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     # current_user: dict = Depends(get_current_active_user) # Optional auth
 ) -> DistilleryModel:
     """
@@ -83,7 +108,7 @@ async def read_single_distillery(
 async def update_existing_distillery(
     distillery_id: int,
     distillery_update: DistilleryUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: dict = Depends(get_current_active_user),  # Protect this route
     # current_user: dict = Depends(get_current_active_superuser) # Or make it admin-only
 ) -> DistilleryModel:
@@ -103,7 +128,7 @@ async def update_existing_distillery(
 @router.delete("/distilleries/{distillery_id}", response_model=DistillerySchema)
 async def delete_existing_distillery(
     distillery_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: dict = Depends(get_current_active_user),  # Protect this route
     # current_user: dict = Depends(get_current_active_superuser) # Or make it admin-only
 ) -> DistilleryModel:
@@ -0,0 +1,59 @@
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from app.auth.auth import get_current_active_user
+from app.models.user import User
+from app.services.export_service import EXPORT_MEDIA_TYPES
+from app.services.export_service import ExportFormat
+from app.services.export_service import distilleries_query
+from app.services.export_service import stream_export
+from app.services.export_service import tastings_query
+from app.services.export_service import user_whiskeys_query
+
+router = APIRouter()
+
+
+def _export_response(
+    stmt: Select[Any], name: str, fmt: ExportFormat
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(stmt, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/export/tastings")
+async def export_tastings(
+    format: ExportFormat = "ndjson",
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Download all of the current user's tastings as NDJSON or CSV.
+    """
+    return _export_response(tastings_query(current_user.id), "tastings", format)
+
+
+@router.get("/export/user-whiskeys")
+async def export_user_whiskeys(
+    format: ExportFormat = "ndjson",
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Download the current user's collection, one row per bottle.
+    """
+    return _export_response(
+        user_whiskeys_query(current_user.id), "user-whiskeys", format
+    )
+
+
+@router.get("/export/distilleries")
+async def export_distilleries(
+    format: ExportFormat = "ndjson",
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    return _export_response(distilleries_query(), "distilleries", format)
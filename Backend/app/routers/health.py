@@ -0,0 +1,57 @@
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi import Depends
+
+from app.auth.auth import get_current_active_superuser
+from app.auth.auth import password_hasher
+from app.db.database import engine
+from app.db.database import pool_status
+from app.db.database import replicas_status
+from app.services.ai_cache import whiskey_info_cache
+from app.services.ai_client import ai_client
+from app.services.analysis_service import analysis_queue
+
+# Internals (pool sizes, replica hosts and lag, queue depths) are for
+# operators only
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+@router.get("/db/pool")
+async def read_db_pool_status() -> dict[str, Any]:
+    """
+    Live connection pool metrics (checked-out, overflow and waiting connections).
+    """
+    return {"primary": pool_status(engine), "replicas": replicas_status()}
+
+
+@router.get("/password-hasher")
+async def read_password_hasher_status() -> dict[str, Any]:
+    """
+    Password hashing pool usage and queue times.
+    """
+    return password_hasher.stats()
+
+
+@router.get("/ai-client")
+async def read_ai_client_status() -> dict[str, Any]:
+    """
+    AI provider calls: concurrency, queue and request times, retries.
+    """
+    return ai_client.stats()
+
+
+@router.get("/ai-cache")
+async def read_ai_cache_status() -> dict[str, Any]:
+    """
+    AI response cache hits and misses, in memory and in the database.
+    """
+    return {"whiskey_info": whiskey_info_cache.stats()}
+
+
+@router.get("/analysis-queue")
+async def read_analysis_queue_status() -> dict[str, Any]:
+    """
+    Collection analysis jobs waiting in this worker's queue.
+    """
+    return analysis_queue.stats()
@@ -0,0 +1,28 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.auth import get_current_active_user
+from app.db.database import get_read_db
+from app.models.user import User
+from app.schemas.recommendation_schema import Recommendation
+from app.services.recommendation_service import recommend_for_user
+
+router = APIRouter()
+
+
+@router.get("/recommendations/personalized", response_model=List[Recommendation])
+async def read_personalized_recommendations(
+    limit: int = Query(10, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+) -> List[Recommendation]:
+    """
+    Recommendations for the current user from the local item-item model.
+    The page's userId parameter is ignored: recommendations are always for
+    the authenticated user.
+    """
+    return await recommend_for_user(db, user_id=current_user.id, limit=limit)
@@ -0,0 +1,109 @@
+import math
+import time
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_read_db
+from app.schemas.search_schema import WhiskeySearch
+from app.schemas.search_schema import WhiskeySearchResponse
+from app.services.search_service import search_whiskeys
+
+# Registered before the whiskeys router so /whiskeys/search isn't taken
+# for a /whiskeys/{user_whiskey_id} lookup
+router = APIRouter()
+
+MAX_AGE_FILTER = 2**31 - 1
+
+
+def _number(name: str, value: Optional[str]) -> Optional[float]:
+    """
+    The Discover page sends empty strings for unset numeric filters.
+    """
+    if value is None or not value.strip():
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        number = math.nan
+    # float() also parses "inf" and "nan"
+    if not math.isfinite(number):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must be a number",
+        )
+    return number
+
+
+def _age(name: str, value: Optional[str]) -> Optional[int]:
+    number = _number(name, value)
+    if number is None:
+        return None
+    # Ages are compared with an INTEGER column
+    if abs(number) > MAX_AGE_FILTER:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} is out of range",
+        )
+    return int(number)
+
+
+def _choice(value: Optional[str]) -> Optional[str]:
+    # "all" is the Discover page's "no filter" option
+    if value is None or not value.strip() or value == "all":
+        return None
+    return value
+
+
+@router.get("/whiskeys/search", response_model=WhiskeySearchResponse)
+async def search_catalog(
+    query: Optional[str] = None,
+    region: Optional[str] = None,
+    type: Optional[str] = None,
+    distillery: Optional[str] = None,
+    min_price: Optional[str] = Query(None, alias="minPrice"),
+    max_price: Optional[str] = Query(None, alias="maxPrice"),
+    min_age: Optional[str] = Query(None, alias="minAge"),
+    max_age: Optional[str] = Query(None, alias="maxAge"),
+    min_abv: Optional[str] = Query(None, alias="minAbv"),
+    max_abv: Optional[str] = Query(None, alias="maxAbv"),
+    min_rating: Optional[str] = Query(None, alias="minRating"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, le=100),
+    facets: bool = True,
+    db: AsyncSession = Depends(get_read_db),
+) -> WhiskeySearchResponse:
+    """
+    Search the whiskey catalog by name (fuzzy on PostgreSQL), region, type,
+    distillery, price, age, ABV and average tasting rating.
+    Facet counts for region, type and distillery are included unless
+    ?facets=false.
+    """
+    started = time.perf_counter()
+    search = WhiskeySearch(
+        query=(query or "").strip() or None,
+        region=_choice(region),
+        type=_choice(type),
+        distillery=_choice(distillery),
+        min_price=_number("minPrice", min_price),
+        max_price=_number("maxPrice", max_price),
+        min_age=_age("minAge", min_age),
+        max_age=_age("maxAge", max_age),
+        min_abv=_number("minAbv", min_abv),
+        max_abv=_number("maxAbv", max_abv),
+        min_rating=_number("minRating", min_rating),
+    )
+    results, total, facet_counts = await search_whiskeys(
+        db, search, skip=skip, limit=limit, with_facets=facets
+    )
+    return WhiskeySearchResponse(
+        results=results,
+        totalFound=total,
+        searchTime=time.perf_counter() - started,
+        facets=facet_counts,
+    )
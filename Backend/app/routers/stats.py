@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.auth import get_current_active_user
+from app.db.database import get_read_db
+from app.models.user import User
+from app.models.user_stats import UserStats as UserStatsModel
+from app.schemas.stats_schema import UserStats
+from app.services.stats_service import get_user_stats
+
+router = APIRouter()
+
+
+@router.get("/stats/", response_model=UserStats)
+async def read_user_stats(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+) -> UserStatsModel:
+    """
+    Dashboard statistics for the current user, read from the rollup table.
+    """
+    return await get_user_stats(db, user_id=current_user.id)
@@ -1,61 +1,108 @@
 from typing import List
+from typing import Optional
 
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Query
+from fastapi import Response
+from fastapi import UploadFile
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.auth import get_current_active_user
 from app.db.database import get_db
+from app.db.database import get_read_db
 from app.models.tasting import Tasting as TastingModel
 from app.models.user import User
 from app.schemas.tasting_schema import Tasting
+from app.schemas.tasting_schema import TastingBatch
+from app.schemas.tasting_schema import TastingBatchResult
 from app.schemas.tasting_schema import TastingCreate
+from app.schemas.tasting_schema import TastingFilters
+from app.schemas.tasting_schema import TastingImportResult
 from app.schemas.tasting_schema import TastingUpdate
+from app.services.import_service import ImportFormat
+from app.services.import_service import import_tastings
+from app.services.tasting_service import TASTING_SORT_KEYS
+from app.services.tasting_service import TastingSort
+from app.services.tasting_service import apply_tasting_batch
 from app.services.tasting_service import create_tasting
 from app.services.tasting_service import delete_tasting
 from app.services.tasting_service import get_tasting
 from app.services.tasting_service import get_tastings_by_user
 from app.services.tasting_service import get_tastings_by_user_whiskey
 from app.services.tasting_service import update_tasting
+from app.utils.pagination import SortOrder
+from app.utils.pagination import parse_cursor
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 
 @router.get("/tastings/", response_model=List[Tasting])
 async def read_tastings(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: TastingSort = "tasting_date",
+    order: SortOrder = "desc",
+    filters: TastingFilters = Depends(),
+    user_whiskey_id: Optional[List[int]] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ) -> List[TastingModel]:
-    return await get_tastings_by_user(
-        db, user_id=current_user.id, skip=skip, limit=limit
+    """
+    List the current user's tastings.
+    Repeat ?user_whiskey_id= to restrict the list to several bottles.
+    Follow the X-Next-Cursor response header with ?cursor= for the next page.
+    """
+    tastings = await get_tastings_by_user(
+        db,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=parse_cursor(cursor, sort),
+        sort=sort,
+        descending=order == "desc",
+        filters=filters,
+        user_whiskey_ids=user_whiskey_id,
     )
+    set_next_cursor(response, tastings, limit, sort, TASTING_SORT_KEYS[sort])
+    return tastings
 
 
 @router.get("/whiskeys/{user_whiskey_id}/tastings/", response_model=List[Tasting])
 async def read_tastings_by_user_whiskey(
     user_whiskey_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: TastingSort = "tasting_date",
+    order: SortOrder = "desc",
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ) -> List[TastingModel]:
-    return await get_tastings_by_user_whiskey(
+    tastings = await get_tastings_by_user_whiskey(
         db,
         user_whiskey_id=user_whiskey_id,
         user_id=current_user.id,
         skip=skip,
         limit=limit,
+        cursor=parse_cursor(cursor, sort),
+        sort=sort,
+        descending=order == "desc",
     )
+    set_next_cursor(response, tastings, limit, sort, TASTING_SORT_KEYS[sort])
+    return tastings
 
 
 @router.post("/tastings/", response_model=Tasting, status_code=status.HTTP_201_CREATED)
 async def create_new_tasting(
     tasting: TastingCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> TastingModel:
     """
@@ -64,10 +111,61 @@ async def create_new_tasting(
     return await create_tasting(db=db, tasting=tasting, user_id=current_user.id)
 
 
+@router.post("/tastings/import", response_model=TastingImportResult)
+async def import_tastings_file(
+    file: UploadFile,
+    format: Optional[ImportFormat] = None,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+) -> TastingImportResult:
+    """
+    Bulk import tastings from a CSV or NDJSON file.
+    The format defaults to CSV for .csv uploads and NDJSON otherwise.
+    Valid rows are imported even when others fail; failures are listed by row.
+    """
+    if format is None:
+        is_csv = (file.filename or "").lower().endswith(".csv")
+        format = "csv" if is_csv else "ndjson"
+    result = await import_tastings(db, file.file, format, user_id=current_user.id)
+    if result is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Could not read the file as UTF-8 {format.upper()}",
+        )
+    return result
+
+
+@router.post("/tastings/batch", response_model=TastingBatchResult)
+async def batch_tastings(
+    batch: TastingBatch,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+) -> TastingBatchResult:
+    """
+    Create, update and delete several tastings in one transaction.
+    Either every change is applied or none is.
+    """
+    if {item.id for item in batch.update} & set(batch.delete):
+        raise HTTPException(
+            status_code=400, detail="A tasting cannot be updated and deleted"
+        )
+    applied = await apply_tasting_batch(db, batch, user_id=current_user.id)
+    if applied is None:
+        raise HTTPException(
+            status_code=404, detail="Tasting not found or not authorized"
+        )
+    created, updated, deleted = applied
+    return TastingBatchResult(
+        created=[Tasting.from_orm(tasting) for tasting in created],
+        updated=[Tasting.from_orm(tasting) for tasting in updated],
+        deleted=deleted,
+    )
+
+
 @router.get("/tastings/{tasting_id}", response_model=Tasting)
 async def read_tasting(
     tasting_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> TastingModel:
     """
@@ -83,7 +181,7 @@ async def read_tasting(
 async def update_existing_tasting(
     tasting_id: int,
     tasting: TastingUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> TastingModel:
     """
@@ -102,7 +200,7 @@ async def update_existing_tasting(
 @router.delete("/tastings/{tasting_id}", response_model=Tasting)
 async def delete_existing_tasting(
     tasting_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> TastingModel:
     """
@@ -0,0 +1,20 @@
+from typing import List
+
+from fastapi import APIRouter
+
+from app.schemas.whiskey_schema import TrendingWhiskey
+from app.services.trending_service import get_trending
+
+# Registered before the whiskeys router so /whiskeys/trending isn't taken
+# for a /whiskeys/{user_whiskey_id} lookup
+router = APIRouter()
+
+
+@router.get("/whiskeys/trending", response_model=List[TrendingWhiskey])
+async def read_trending_whiskeys() -> List[TrendingWhiskey]:
+    """
+    Whiskeys with the most (and best rated) recent tastings, served from a
+    snapshot refreshed in the background every TRENDING_REFRESH_INTERVAL
+    seconds.
+    """
+    return get_trending()
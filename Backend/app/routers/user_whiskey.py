@@ -1,42 +1,73 @@
 from typing import List
+from typing import Optional
 
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Response
 from fastapi import status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.auth import get_current_active_user
 from app.db.database import get_db
+from app.db.database import get_read_db
 from app.models.user import User
 from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
 from app.schemas.user_whiskey_schema import UserWhiskey
+from app.schemas.user_whiskey_schema import UserWhiskeyBatch
+from app.schemas.user_whiskey_schema import UserWhiskeyBatchResult
 from app.schemas.user_whiskey_schema import UserWhiskeyCreate
+from app.schemas.user_whiskey_schema import UserWhiskeyFilters
 from app.schemas.user_whiskey_schema import UserWhiskeyUpdate
 from app.services import user_whiskey_service
+from app.services.user_whiskey_service import UserWhiskeySort
+from app.utils.pagination import SortOrder
+from app.utils.pagination import parse_cursor
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 
 @router.get("/user-whiskeys/", response_model=List[UserWhiskey])
 async def read_user_whiskeys(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: UserWhiskeySort = "created_date",
+    order: SortOrder = "desc",
+    filters: UserWhiskeyFilters = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ) -> List[UserWhiskeyModel]:
     """
     Retrieve the current user's whiskey collection.
     """
-    return await user_whiskey_service.get_user_whiskeys(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
+    user_whiskeys = await user_whiskey_service.get_user_whiskeys(
+        db=db,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=parse_cursor(cursor, sort),
+        sort=sort,
+        descending=order == "desc",
+        filters=filters,
+    )
+    set_next_cursor(
+        response,
+        user_whiskeys,
+        limit,
+        sort,
+        user_whiskey_service.USER_WHISKEY_SORT_KEYS[sort],
     )
+    return user_whiskeys
 
 
 @router.get("/user-whiskeys/{user_whiskey_id}", response_model=UserWhiskey)
 async def read_user_whiskey(
     user_whiskey_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> UserWhiskeyModel:
     """
@@ -58,14 +89,50 @@ async def read_user_whiskey(
 )
 async def create_user_whiskey(
     user_whiskey: UserWhiskeyCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> UserWhiskeyModel:
     """
     Add a whiskey to the current user's collection.
     """
-    return await user_whiskey_service.create_user_whiskey(
-        db=db, user_whiskey=user_whiskey, user_id=current_user.id
+    try:
+        return await user_whiskey_service.create_user_whiskey(
+            db=db, user_whiskey=user_whiskey, user_id=current_user.id
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Whiskey does not exist or is already in your collection",
+        )
+
+
+@router.post("/user-whiskeys/batch", response_model=UserWhiskeyBatchResult)
+async def batch_user_whiskeys(
+    batch: UserWhiskeyBatch,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_active_user),
+) -> UserWhiskeyBatchResult:
+    """
+    Update and delete several collection entries in one transaction,
+    e.g. toggling favorites. Either every change is applied or none is.
+    """
+    if {item.id for item in batch.update} & set(batch.delete):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A collection entry cannot be updated and deleted",
+        )
+    applied = await user_whiskey_service.apply_user_whiskey_batch(
+        db=db, batch=batch, user_id=current_user.id
+    )
+    if applied is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User whiskey not found or not authorized",
+        )
+    updated, deleted = applied
+    return UserWhiskeyBatchResult(
+        updated=[UserWhiskey.from_orm(user_whiskey) for user_whiskey in updated],
+        deleted=deleted,
     )
 
 
@@ -73,7 +140,7 @@ async def create_user_whiskey(
 async def update_user_whiskey(
     user_whiskey_id: int,
     user_whiskey_update: UserWhiskeyUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> UserWhiskeyModel:
     """
@@ -96,7 +163,7 @@ async def update_user_whiskey(
 @router.delete("/user-whiskeys/{user_whiskey_id}", response_model=UserWhiskey)
 async def delete_user_whiskey(
     user_whiskey_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> UserWhiskeyModel:
     """
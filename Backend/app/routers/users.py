@@ -1,8 +1,10 @@
 from typing import List
+from typing import Optional
 
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Response
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,10 +12,15 @@ from app.auth.auth import (
     get_current_active_user,  # get_current_active_superuser; Optional for admin
 )
 from app.db.database import get_db
+from app.db.database import get_read_db
 from app.models.user import User as UserModel
 from app.schemas.user_schema import User as UserSchema
 from app.schemas.user_schema import UserUpdate as UserUpdateSchema
 from app.services import user_service  # Assuming you have a user_service.py
+from app.services.user_service import UserSort
+from app.utils.pagination import SortOrder
+from app.utils.pagination import parse_cursor
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
@@ -23,9 +30,13 @@ router = APIRouter()
 
 @router.get("/users/", response_model=List[UserSchema])
 async def read_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: UserSort = "created_date",
+    order: SortOrder = "asc",
+    db: AsyncSession = Depends(get_read_db),
     # current_user: UserModel = Depends(get_current_active_superuser)
     # Example for admin-only
     current_user: UserModel = Depends(
@@ -36,14 +47,22 @@ async def read_users(
     Retrieve all users.
     Consider making this an admin-only endpoint in a production environment.
     """
-    users = await user_service.get_users(db, skip=skip, limit=limit)
+    users = await user_service.get_users(
+        db,
+        skip=skip,
+        limit=limit,
+        cursor=parse_cursor(cursor, sort),
+        sort=sort,
+        descending=order == "desc",
+    )
+    set_next_cursor(response, users, limit, sort, user_service.USER_SORT_KEYS[sort])
     return users
 
 
 @router.get("/users/{user_id}", response_model=UserSchema)
 async def read_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: UserModel = Depends(get_current_active_user),
 ) -> UserSchema:
     """
@@ -66,7 +85,7 @@ async def read_user(
 @router.put("/users/me", response_model=UserSchema)
 async def update_current_user_me(
     user_update: UserUpdateSchema,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: UserModel = Depends(get_current_active_user),
 ) -> UserSchema:
     """
@@ -88,7 +107,7 @@ async def update_current_user_me(
 async def update_specific_user(
     user_id: int,
     user_update: UserUpdateSchema,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: UserModel = Depends(
         get_current_active_user
     ),  # Or get_current_active_superuser
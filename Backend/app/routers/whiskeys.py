@@ -1,35 +1,64 @@
 from typing import List
+from typing import Optional
 
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Response
 from fastapi import status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.auth import get_current_active_user
 from app.db.database import get_db
+from app.db.database import get_read_db
 from app.models.user import User
 from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
 from app.schemas.user_whiskey_schema import UserWhiskey
 from app.schemas.user_whiskey_schema import UserWhiskeyCreate
+from app.schemas.user_whiskey_schema import UserWhiskeyFilters
 from app.schemas.user_whiskey_schema import UserWhiskeyUpdate
+from app.services.user_whiskey_service import USER_WHISKEY_SORT_KEYS
+from app.services.user_whiskey_service import UserWhiskeySort
 from app.services.user_whiskey_service import create_user_whiskey
 from app.services.user_whiskey_service import delete_user_whiskey
 from app.services.user_whiskey_service import get_user_whiskey
 from app.services.user_whiskey_service import get_user_whiskeys
 from app.services.user_whiskey_service import update_user_whiskey
+from app.utils.pagination import SortOrder
+from app.utils.pagination import parse_cursor
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
 
 @router.get("/whiskeys/", response_model=List[UserWhiskey])
 async def read_user_whiskeys(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: UserWhiskeySort = "created_date",
+    order: SortOrder = "desc",
+    filters: UserWhiskeyFilters = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
 ) -> List[UserWhiskeyModel]:
-    return await get_user_whiskeys(db, user_id=current_user.id, skip=skip, limit=limit)
+    """
+    List the current user's collection, filtered and sorted in SQL.
+    """
+    user_whiskeys = await get_user_whiskeys(
+        db,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=parse_cursor(cursor, sort),
+        sort=sort,
+        descending=order == "desc",
+        filters=filters,
+    )
+    set_next_cursor(response, user_whiskeys, limit, sort, USER_WHISKEY_SORT_KEYS[sort])
+    return user_whiskeys
 
 
 @router.post(
@@ -37,18 +66,24 @@ async def read_user_whiskeys(
 )
 async def create_user_whiskey_entry(
     whiskey: UserWhiskeyCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> UserWhiskeyModel:
-    return await create_user_whiskey(
-        db=db, user_whiskey=whiskey, user_id=current_user.id
-    )
+    try:
+        return await create_user_whiskey(
+            db=db, user_whiskey=whiskey, user_id=current_user.id
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=400,
+            detail="Whiskey does not exist or is already in your collection",
+        )
 
 
 @router.get("/whiskeys/{user_whiskey_id}", response_model=UserWhiskey)
 async def read_single_user_whiskey(
     user_whiskey_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> UserWhiskeyModel:
     whiskey = await get_user_whiskey(
@@ -63,7 +98,7 @@ async def read_single_user_whiskey(
 async def update_user_whiskey_entry(
     user_whiskey_id: int,
     whiskey: UserWhiskeyUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> UserWhiskeyModel:
     updated = await update_user_whiskey(
@@ -82,7 +117,7 @@ async def update_user_whiskey_entry(
 @router.delete("/whiskeys/{user_whiskey_id}", response_model=UserWhiskey)
 async def delete_user_whiskey_entry(
     user_whiskey_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
     current_user: User = Depends(get_current_active_user),
 ) -> UserWhiskeyModel:
     deleted = await delete_user_whiskey(
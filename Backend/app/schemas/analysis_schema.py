@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import Literal
+from typing import Optional
+
+from pydantic import BaseModel
+
+JobStatus = Literal["pending", "running", "completed", "failed"]
+
+
+class AnalysisJob(BaseModel):
+    """A collection analysis job; result is set once it completed"""
+
+    id: int
+    status: JobStatus
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_date: datetime
+    started_date: Optional[datetime] = None
+    finished_date: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,20 @@
+from typing import List
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.schemas.stats_schema import UserStats
+from app.schemas.tasting_schema import Tasting
+from app.schemas.user_whiskey_schema import UserWhiskey
+
+
+class RecentTasting(Tasting):
+    whiskey_name: Optional[str] = None
+
+
+class Dashboard(BaseModel):
+    """Everything the dashboard page shows, in one response"""
+
+    stats: UserStats
+    recent_whiskeys: List[UserWhiskey]
+    recent_tastings: List[RecentTasting]
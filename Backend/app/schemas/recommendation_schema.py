@@ -0,0 +1,15 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.search_schema import WhiskeySearchResult
+
+
+class Recommendation(BaseModel):
+    """A whiskey suggested for the user, in the Discover page's shape"""
+
+    id: int  # the recommended whiskey's id, unique within a response
+    whiskey: WhiskeySearchResult
+    confidence: float  # 0-1
+    reason: str
+    tags: List[str]
@@ -0,0 +1,60 @@
+from typing import Dict
+from typing import List
+from typing import Literal
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class WhiskeySearch(BaseModel):
+    """Catalog search criteria; unset fields don't filter"""
+
+    query: Optional[str] = None
+    region: Optional[str] = None
+    type: Optional[str] = None
+    distillery: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+    min_abv: Optional[float] = None
+    max_abv: Optional[float] = None
+    min_rating: Optional[float] = None
+
+
+class WhiskeySearchResult(BaseModel):
+    """A catalog whiskey as shown on the Discover page"""
+
+    id: int
+    name: str
+    distillery: Optional[str] = None
+    region: Optional[str] = None
+    type: Optional[str] = None
+    age: Optional[int] = None
+    abv: Optional[float] = None
+    rating: Optional[float] = None
+    description: Optional[str] = None
+    estimated_price: Optional[float] = None
+    image_url: Optional[str] = None
+    availability: str
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class WhiskeySearchResponse(BaseModel):
+    # Field names follow the Discover page's existing contract
+    results: List[WhiskeySearchResult]
+    totalFound: int
+    searchTime: float
+    facets: Dict[str, List[FacetCount]]
+
+
+class Suggestion(BaseModel):
+    """An autocomplete match: a catalog whiskey or a distillery"""
+
+    type: Literal["whiskey", "distillery"]
+    id: int
+    name: str
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class UserStats(BaseModel):
+    """Dashboard summary of a user's collection and tastings"""
+
+    total_whiskeys: int
+    total_tastings: int
+    unique_distilleries: int
+    average_rating: Optional[float] = None
+    collection_value: float
+
+    class Config:
+        from_attributes = True
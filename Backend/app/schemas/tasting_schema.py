@@ -1,4 +1,5 @@
 from datetime import date
+from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
@@ -36,6 +37,17 @@ class TastingUpdate(BaseModel):
     setting: Optional[str] = None
 
 
+class TastingFilters(BaseModel):
+    """Tasting list filters, evaluated in SQL"""
+
+    min_rating: Optional[int] = None
+    max_rating: Optional[int] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    shared: Optional[bool] = None
+    setting: Optional[str] = None
+
+
 class Tasting(TastingBase):
     """Schema for a complete tasting with id"""
 
@@ -49,3 +61,34 @@ class Tasting(TastingBase):
         """Configure Pydantic to work with ORM"""
 
         from_attributes = True
+
+
+class TastingImportError(BaseModel):
+    """A rejected row of a bulk import, numbered from 1 (excluding a CSV header)"""
+
+    row: int
+    error: str
+
+
+class TastingImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TastingImportError]
+
+
+class TastingBatchUpdate(TastingUpdate):
+    id: int
+
+
+class TastingBatch(BaseModel):
+    """Several tasting changes, applied together or not at all"""
+
+    create: List[TastingCreate] = []
+    update: List[TastingBatchUpdate] = []
+    delete: List[int] = []
+
+
+class TastingBatchResult(BaseModel):
+    created: List[Tasting]
+    updated: List[Tasting]
+    deleted: List[int]
@@ -45,6 +45,13 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    """Schema for exchanging a refresh token for a new token pair"""
+
+    refresh_token: str
 
 
 class TokenData(BaseModel):
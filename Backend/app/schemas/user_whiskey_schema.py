@@ -1,5 +1,6 @@
 from datetime import date
 from datetime import datetime
+from typing import List
 from typing import Optional
 
 from pydantic import BaseModel
@@ -22,6 +23,22 @@ class UserWhiskeyUpdate(UserWhiskeyBase):
     pass
 
 
+class UserWhiskeyFilters(BaseModel):
+    """Collection filters, evaluated in SQL against the joined whiskey"""
+
+    region: Optional[str] = None
+    type: Optional[str] = None
+    distillery: Optional[str] = None
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+    min_abv: Optional[float] = None
+    max_abv: Optional[float] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    is_favorite: Optional[bool] = None
+    is_owned: Optional[bool] = None
+
+
 class UserWhiskey(UserWhiskeyBase):
     id: int
     user_id: int
@@ -31,3 +48,19 @@ class UserWhiskey(UserWhiskeyBase):
 
     class Config:
         from_attributes = True
+
+
+class UserWhiskeyBatchUpdate(UserWhiskeyUpdate):
+    id: int
+
+
+class UserWhiskeyBatch(BaseModel):
+    """Several collection changes, applied together or not at all"""
+
+    update: List[UserWhiskeyBatchUpdate] = []
+    delete: List[int] = []
+
+
+class UserWhiskeyBatchResult(BaseModel):
+    updated: List[UserWhiskey]
+    deleted: List[int]
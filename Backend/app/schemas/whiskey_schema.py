@@ -35,3 +35,13 @@ class Whiskey(WhiskeyBase):
         """Configure Pydantic to parse obj to JSON"""
 
         from_attributes = True
+
+
+class TrendingWhiskey(BaseModel):
+    """A whiskey in the trending ranking"""
+
+    id: int
+    name: str
+    mentions: int  # tastings in the current window
+    trend: str  # change against the previous window, e.g. "+12%"
+    score: float
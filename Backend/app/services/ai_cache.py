@@ -0,0 +1,174 @@
+import asyncio
+import copy
+import os
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import async_session
+from app.models.ai_cache import AICacheEntry
+from app.utils.cache import TTLCache
+from app.utils.text import normalize
+
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+AI_CACHE_MEMORY_SIZE = int(os.getenv("AI_CACHE_MEMORY_SIZE", "1000"))
+AI_CACHE_MEMORY_TTL = int(os.getenv("AI_CACHE_MEMORY_TTL", "3600"))  # seconds
+AI_CACHE_MAX_ROWS = int(os.getenv("AI_CACHE_MAX_ROWS", "50000"))
+AI_CACHE_PRUNE_INTERVAL = int(os.getenv("AI_CACHE_PRUNE_INTERVAL", "3600"))
+
+
+async def _upsert(
+    db: AsyncSession, key: str, response: dict[str, Any], expires_at: datetime
+) -> None:
+    """
+    Write an entry in one INSERT ... ON CONFLICT DO UPDATE, so workers
+    caching the same query at once don't race between a read and an insert.
+    """
+    values = {"key": key, "response": response, "expires_at": expires_at}
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt: Any = postgresql.insert(AICacheEntry).values(**values)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(AICacheEntry).values(**values)
+    else:
+        await db.merge(AICacheEntry(**values))
+        return
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[AICacheEntry.key],
+            set_={
+                "response": stmt.excluded.response,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+    )
+
+
+class AIResponseCache:
+    """
+    Two-tier cache for AI responses, keyed by the normalized query, so
+    "Lagavulin 16" and "lagavulin  16" share an entry.
+    The in-process LRU answers repeat lookups without I/O; the ai_cache
+    table behind it is shared by all workers and survives restarts.
+    Database errors only cost a miss, never the lookup itself.
+    Callers get their own copy of a response, so mutating it never alters
+    the cached entry.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self.memory: TTLCache[str, dict[str, Any]] = TTLCache(
+            AI_CACHE_MEMORY_SIZE, AI_CACHE_MEMORY_TTL
+        )
+        self.db_hits = 0
+        self.db_misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _key(self, query: str) -> str:
+        return f"{self.namespace}:{normalize(query)}"
+
+    def peek(self, query: str) -> Optional[dict[str, Any]]:
+        """
+        The in-process tier only, without I/O. Not counted as a hit or a
+        miss: callers that find nothing go on to get, which counts it.
+        """
+        value = self.memory.peek(self._key(query))
+        return copy.deepcopy(value) if value is not None else None
+
+    async def get(self, query: str) -> Optional[dict[str, Any]]:
+        key = self._key(query)
+        value = self.memory.get(key)
+        if value is not None:
+            return copy.deepcopy(value)
+
+        try:
+            async with async_session() as db:
+                value = await db.scalar(
+                    select(AICacheEntry.response).where(
+                        AICacheEntry.key == key,
+                        AICacheEntry.expires_at > datetime.now(timezone.utc),
+                    )
+                )
+        except SQLAlchemyError as e:
+            self.errors += 1
+            print(f"AI cache lookup failed: {e}")
+            return None
+        if value is None:
+            self.db_misses += 1
+            return None
+        self.db_hits += 1
+        self.memory.set(key, value)
+        return copy.deepcopy(value)
+
+    async def set(self, query: str, value: dict[str, Any]) -> None:
+        key = self._key(query)
+        self.memory.set(key, copy.deepcopy(value))
+        try:
+            async with async_session() as db:
+                await _upsert(
+                    db,
+                    key,
+                    value,
+                    datetime.now(timezone.utc) + timedelta(seconds=AI_CACHE_TTL),
+                )
+                await db.commit()
+        except SQLAlchemyError as e:
+            self.errors += 1
+            print(f"AI cache write failed: {e}")
+            return
+        self.writes += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "db_hits": self.db_hits,
+            "db_misses": self.db_misses,
+            "writes": self.writes,
+            "errors": self.errors,
+        }
+
+
+whiskey_info_cache = AIResponseCache("whiskey_info")
+
+
+async def prune_ai_cache() -> int:
+    """
+    Delete expired entries, then the oldest ones beyond AI_CACHE_MAX_ROWS.
+    Returns the number of rows deleted.
+    """
+    async with async_session() as db:
+        expired: Any = await db.execute(
+            delete(AICacheEntry).where(
+                AICacheEntry.expires_at <= datetime.now(timezone.utc)
+            )
+        )
+        surplus: Any = await db.execute(
+            delete(AICacheEntry).where(
+                AICacheEntry.key.in_(
+                    select(AICacheEntry.key)
+                    .order_by(AICacheEntry.expires_at.desc())
+                    .offset(AI_CACHE_MAX_ROWS)
+                )
+            )
+        )
+        await db.commit()
+    return expired.rowcount + surplus.rowcount
+
+
+async def prune_ai_cache_periodically(interval: int) -> None:
+    while True:
+        try:
+            await prune_ai_cache()
+        except (SQLAlchemyError, OSError) as e:
+            print(f"Could not prune the AI cache: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import os
+import random
+import time
+from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from typing import Optional
+
+import httpx
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "5"))
+AI_READ_TIMEOUT = float(os.getenv("AI_READ_TIMEOUT", "60"))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "2"))
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+
+# Backoff before retry n is uniform in [0, min(cap, base * 2**n)] seconds
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_CAP = 8.0
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class AIServiceError(Exception):
+    """The AI provider could not be reached or kept failing."""
+
+
+class AIClient:
+    """
+    Async client for the OpenAI-compatible chat API.
+    One keep-alive connection pool is shared by all requests, and at most
+    `max_concurrency` calls are in flight; the rest wait on a semaphore,
+    and the time spent waiting is recorded as queue time.
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    jittered exponential backoff, outside the semaphore.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str],
+        max_concurrency: int,
+        max_retries: int,
+        timeout: httpx.Timeout,
+    ) -> None:
+        self.base_url = base_url
+        self._api_key = api_key
+        self._timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.waiting = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.completed = 0
+        self.retries = 0
+        self.failures = 0
+        self.total_queue_time = 0.0
+        self.total_request_time = 0.0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created on first use so it belongs to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self._api_key}"},
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """
+        Hold one of the `max_concurrency` slots for a request.
+        """
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.requests += 1
+        started = time.perf_counter()
+        self.total_queue_time += started - queued_at
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.total_request_time += time.perf_counter() - started
+            self._semaphore.release()
+
+    async def _send(self, path: str, payload: dict[str, Any]) -> httpx.Response:
+        async with self._slot():
+            return await self._get_client().post(path, json=payload)
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.replace(".", "", 1).isdigit():
+                return min(float(retry_after), RETRY_BACKOFF_CAP)
+        return random.uniform(
+            0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2**attempt)
+        )
+
+    async def post(self, path: str, payload: dict[str, Any]) -> Any:
+        """
+        POST a JSON payload and return the decoded JSON response.
+        Raises AIServiceError once retries are exhausted or on a
+        non-retryable error response.
+        """
+        attempt = 0
+        while True:
+            response: Optional[httpx.Response] = None
+            try:
+                response = await self._send(path, payload)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    result = response.json()
+                    self.completed += 1
+                    return result
+                error: Exception = AIServiceError(
+                    f"AI provider returned {response.status_code}"
+                )
+            except httpx.HTTPStatusError as e:
+                self.failures += 1
+                raise AIServiceError(
+                    f"AI provider returned {e.response.status_code}"
+                ) from e
+            except ValueError as e:
+                self.failures += 1
+                raise AIServiceError("AI provider returned invalid JSON") from e
+            except httpx.TransportError as e:
+                # Timeouts and connection errors
+                error = e
+
+            if attempt >= self.max_retries:
+                self.failures += 1
+                raise AIServiceError(f"AI request failed: {error!r}") from error
+            await asyncio.sleep(self._backoff(attempt, response))
+            attempt += 1
+            self.retries += 1
+
+    async def chat_completion(self, payload: dict[str, Any]) -> str:
+        """
+        Run a chat completion and return the first choice's message content.
+        """
+        result = await self.post("/chat/completions", payload)
+        try:
+            return str(result["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError) as e:
+            raise AIServiceError("Unexpected chat completion response") from e
+
+    def _delta(self, line: str) -> Optional[str]:
+        """
+        Content of one server-sent line of a streamed completion: "" for
+        lines without content, None at the end of the stream.
+        """
+        if not line.startswith("data:"):
+            return ""
+        data = line[len("data:") :].strip()
+        if data == "[DONE]":
+            return None
+        try:
+            return str(json.loads(data)["choices"][0]["delta"].get("content") or "")
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            self.failures += 1
+            raise AIServiceError("Unexpected chat completion chunk") from e
+
+    async def stream_chat_completion(
+        self, payload: dict[str, Any]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Run a chat completion in streaming mode and yield the content deltas
+        as they arrive. The slot is held until the stream ends.
+        Failures before the response starts are retried like post(); once
+        it started, an error ends the stream with AIServiceError.
+        """
+        payload = {**payload, "stream": True}
+        attempt = 0
+        streamed = False
+        while True:
+            retry_response: Optional[httpx.Response] = None
+            try:
+                async with self._slot():
+                    async with self._get_client().stream(
+                        "POST", "/chat/completions", json=payload
+                    ) as response:
+                        if response.status_code in RETRY_STATUSES:
+                            retry_response = response
+                            error: Exception = AIServiceError(
+                                f"AI provider returned {response.status_code}"
+                            )
+                        elif response.is_error:
+                            self.failures += 1
+                            raise AIServiceError(
+                                f"AI provider returned {response.status_code}"
+                            )
+                        else:
+                            async for line in response.aiter_lines():
+                                delta = self._delta(line)
+                                if delta is None:
+                                    break
+                                if delta:
+                                    streamed = True
+                                    yield delta
+                            self.completed += 1
+                            return
+            except httpx.TransportError as e:
+                if streamed:
+                    # Text was already handed out; a retry would repeat it
+                    self.failures += 1
+                    raise AIServiceError(f"AI stream broke off: {e!r}") from e
+                error = e
+
+            if attempt >= self.max_retries:
+                self.failures += 1
+                raise AIServiceError(f"AI request failed: {error!r}") from error
+            await asyncio.sleep(self._backoff(attempt, retry_response))
+            attempt += 1
+            self.retries += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "completed": self.completed,
+            "retries": self.retries,
+            "failures": self.failures,
+            "avg_queue_ms": (
+                self.total_queue_time / self.requests * 1000 if self.requests else 0.0
+            ),
+            "avg_request_ms": (
+                self.total_request_time / self.requests * 1000 if self.requests else 0.0
+            ),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+ai_client = AIClient(
+    OPENAI_BASE_URL,
+    OPENAI_API_KEY,
+    max_concurrency=AI_MAX_CONCURRENCY,
+    max_retries=AI_MAX_RETRIES,
+    timeout=httpx.Timeout(AI_READ_TIMEOUT, connect=AI_CONNECT_TIMEOUT),
+)
@@ -1,146 +1,236 @@
 import json
-import os
+import re
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
 from typing import Any
 from typing import Dict
 from typing import List
-
-import requests
+from typing import Set
+from typing import Tuple
 
 from app.models.tasting import Tasting
-from app.models.whiskey import Whiskey
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
-
-def search_whiskey_info(query: str) -> Dict[str, Any]:
+from app.models.user_whiskey import UserWhiskey
+from app.services.ai_cache import whiskey_info_cache
+from app.services.ai_client import ai_client
+from app.utils.singleflight import SingleFlight
+from app.utils.text import normalize
+
+whiskey_info_lookups: SingleFlight[str, Dict[str, Any]] = SingleFlight()
+
+WHISKEY_INFO_ERROR = {
+    "exists": False,
+    "error_message": "לא הצלחנו למצוא מידע על הוויסקי המבוקש",
+}
+
+# "label: value" fields of a whiskey info answer; each fits on one line, so
+# they can also be extracted while the answer is still streaming
+FIELD_PATTERNS = {
+    "distillery": re.compile(r"מזקקה: ([^\n.]+)"),
+    "region": re.compile(r"אזור: ([^\n.]+)"),
+    "country": re.compile(r"מדינה: ([^\n.]+)"),
+    "nose": re.compile(r"אף: ([^\n.]+)"),
+    "palate": re.compile(r"חיך: ([^\n.]+)"),
+    "finish": re.compile(r"סיומת: ([^\n.]+)"),
+}
+
+
+async def search_whiskey_info(query: str) -> Dict[str, Any]:
     """Search for information about a whiskey or distillery using the OpenAI API"""
-    try:
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json",
-        }
-
-        data = {
-            "model": "gpt-4",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": (
-                        "אתה מומחה ויסקי שמספק מידע מדויק על סוגי ויסקי ומזקקות.\n"
-                        "יש להפריד בין מידע על מזקקה למידע על ויסקי ספציפי.\n"
-                        "לתת מידע מפורט על האזור, חוויית הטעימה ופרטי ייצור.\n"
-                        "להוסיף עובדות מעניינות שעשויות להיות רלוונטיות לאוסף הוויסקי."
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": (
-                        f"ספק לי מידע מפורט על הוויסקי או המזקקה: {query}\n"
-                        "אם מדובר בויסקי ספציפי:\n"
-                        "- שם המזקקה\n"
-                        "- אזור, מדינה\n"
-                        "- תהליך הייצור והיישון\n"
-                        "- פרופיל טעם (אף/חיך/סיומת)\n"
-                        "- עובדות מעניינות\n\n"
-                        "אם מדובר במזקקה:\n"
-                        "- שם מלא\n"
-                        "- אזור, מדינה\n"
-                        "- היסטוריה\n"
-                        "- סוגי הוויסקי האופייניים\n"
-                        "- עובדות מעניינות\n\n"
-                        "השתמש בעברית בלבד."
-                    ),
-                },
-            ],
-            "temperature": 0.7,
-        }
-
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions", headers=headers, json=data
+    cached = whiskey_info_cache.peek(query)
+    if cached is not None:
+        return cached
+    # Concurrent lookups of the same bottle share one cache read and at
+    # most one provider call
+    return await whiskey_info_lookups.do(
+        normalize(query), lambda: _fetch_whiskey_info(query)
+    )
+
+
+def _whiskey_info_request(query: str) -> Dict[str, Any]:
+    return {
+        "model": "gpt-4",
+        "messages": [
+            {
+                "role": "system",
+                "content": (
+                    "אתה מומחה ויסקי שמספק מידע מדויק על סוגי ויסקי ומזקקות.\n"
+                    "יש להפריד בין מידע על מזקקה למידע על ויסקי ספציפי.\n"
+                    "לתת מידע מפורט על האזור, חוויית הטעימה ופרטי ייצור.\n"
+                    "להוסיף עובדות מעניינות שעשויות להיות רלוונטיות לאוסף הוויסקי."
+                ),
+            },
+            {
+                "role": "user",
+                "content": (
+                    f"ספק לי מידע מפורט על הוויסקי או המזקקה: {query}\n"
+                    "אם מדובר בויסקי ספציפי:\n"
+                    "- שם המזקקה\n"
+                    "- אזור, מדינה\n"
+                    "- תהליך הייצור והיישון\n"
+                    "- פרופיל טעם (אף/חיך/סיומת)\n"
+                    "- עובדות מעניינות\n\n"
+                    "אם מדובר במזקקה:\n"
+                    "- שם מלא\n"
+                    "- אזור, מדינה\n"
+                    "- היסטוריה\n"
+                    "- סוגי הוויסקי האופייניים\n"
+                    "- עובדות מעניינות\n\n"
+                    "השתמש בעברית בלבד."
+                ),
+            },
+        ],
+        "temperature": 0.7,
+    }
+
+
+def parse_whiskey_info(query: str, content: str) -> Dict[str, Any]:
+    """
+    Extract the structured fields from a complete whiskey info answer.
+    """
+    result_data = {"name": query, "description": content, "exists": True}
+
+    is_distillery = "מזקקה" in content[:200].lower() and "סיומת" not in content
+    result_data["is_distillery"] = is_distillery
+
+    if not is_distillery:
+        distillery_match = FIELD_PATTERNS["distillery"].search(content)
+        if distillery_match:
+            result_data["distillery"] = distillery_match.group(1).strip()
+
+        region_match = FIELD_PATTERNS["region"].search(content)
+        if region_match:
+            result_data["region"] = region_match.group(1).strip()
+
+        country_match = FIELD_PATTERNS["country"].search(content) or re.search(
+            r"מיוצר ב([^\n.]+)", content
         )
-        response.raise_for_status()
-
-        result = response.json()
-        content = result["choices"][0]["message"]["content"]
-
-        result_data = {"name": query, "description": content, "exists": True}
-
-        is_distillery = "מזקקה" in content[:200].lower() and "סיומת" not in content
-        result_data["is_distillery"] = is_distillery
-
-        import re
-
-        if not is_distillery:
-            distillery_match = re.search(r"מזקקה: ([^\n.]+)", content)
-            if distillery_match:
-                result_data["distillery"] = distillery_match.group(1).strip()
-
-            region_match = re.search(r"אזור: ([^\n.]+)", content)
-            if region_match:
-                result_data["region"] = region_match.group(1).strip()
-
-            country_match = re.search(r"מדינה: ([^\n.]+)", content) or re.search(
-                r"מיוצר ב([^\n.]+)", content
-            )
-            if country_match:
-                result_data["country"] = country_match.group(1).strip()
+        if country_match:
+            result_data["country"] = country_match.group(1).strip()
+
+        nose_match = FIELD_PATTERNS["nose"].search(content)
+        palate_match = FIELD_PATTERNS["palate"].search(content)
+        finish_match = FIELD_PATTERNS["finish"].search(content)
+
+        taste_profile = {}
+        if nose_match:
+            taste_profile["nose"] = nose_match.group(1).strip()
+        if palate_match:
+            taste_profile["palate"] = palate_match.group(1).strip()
+        if finish_match:
+            taste_profile["finish"] = finish_match.group(1).strip()
+
+        if taste_profile:
+            result_data["taste_profile"] = taste_profile
+
+    else:
+        region_match = FIELD_PATTERNS["region"].search(content)
+        if region_match:
+            result_data["region"] = region_match.group(1).strip()
+
+        country_match = FIELD_PATTERNS["country"].search(content)
+        if country_match:
+            result_data["country"] = country_match.group(1).strip()
+
+    facts = []
+    facts_section = re.search(r"עובדות מעניינות:?([\s\S]+?)($|(?=##))", content)
+    if facts_section:
+        facts_text = facts_section.group(1)
+        fact_items = re.findall(r"[-•*]\s*([^\n]+)", facts_text)
+        if fact_items:
+            facts = [item.strip() for item in fact_items]
+        else:
+            fact_items = [
+                line.strip() for line in facts_text.split("\n") if line.strip()
+            ]
+            if fact_items:
+                facts = fact_items
 
-            nose_match = re.search(r"אף: ([^\n.]+)", content)
-            palate_match = re.search(r"חיך: ([^\n.]+)", content)
-            finish_match = re.search(r"סיומת: ([^\n.]+)", content)
+    if facts:
+        result_data["interesting_facts"] = facts
 
-            taste_profile = {}
-            if nose_match:
-                taste_profile["nose"] = nose_match.group(1).strip()
-            if palate_match:
-                taste_profile["palate"] = palate_match.group(1).strip()
-            if finish_match:
-                taste_profile["finish"] = finish_match.group(1).strip()
+    return result_data
 
-            if taste_profile:
-                result_data["taste_profile"] = taste_profile
 
-        else:
-            region_match = re.search(r"אזור: ([^\n.]+)", content)
-            if region_match:
-                result_data["region"] = region_match.group(1).strip()
-
-            country_match = re.search(r"מדינה: ([^\n.]+)", content)
-            if country_match:
-                result_data["country"] = country_match.group(1).strip()
-
-        facts = []
-        facts_section = re.search(r"עובדות מעניינות:?([\s\S]+?)($|(?=##))", content)
-        if facts_section:
-            facts_text = facts_section.group(1)
-            fact_items = re.findall(r"[-•*]\s*([^\n]+)", facts_text)
-            if fact_items:
-                facts = [item.strip() for item in fact_items]
-            else:
-                fact_items = [
-                    line.strip() for line in facts_text.split("\n") if line.strip()
-                ]
-                if fact_items:
-                    facts = fact_items
+def _line_fields(line: str) -> Dict[str, str]:
+    """
+    Fields found on one line of an answer still being generated.
+    """
+    fields = {}
+    for field, pattern in FIELD_PATTERNS.items():
+        match = pattern.search(line)
+        if match:
+            fields[field] = match.group(1).strip()
+    return fields
 
-        if facts:
-            result_data["interesting_facts"] = facts
 
+async def _fetch_whiskey_info(query: str) -> Dict[str, Any]:
+    cached = await whiskey_info_cache.get(query)
+    if cached is not None:
+        return cached
+    try:
+        content = await ai_client.chat_completion(_whiskey_info_request(query))
+        result_data = parse_whiskey_info(query, content)
+        await whiskey_info_cache.set(query, result_data)
         return result_data
 
     except Exception as e:
         print(f"Error in AI service: {e}")
-        return {
-            "exists": False,
-            "error_message": "לא הצלחנו למצוא מידע על הוויסקי המבוקש",
-        }
+        return dict(WHISKEY_INFO_ERROR)
+
+
+async def stream_whiskey_info(
+    query: str,
+) -> AsyncGenerator[Tuple[str, Any], None]:
+    """
+    Streaming variant of search_whiskey_info, as (event, data) pairs:
+    "token" for each piece of text as the provider produces it, "field" for
+    each line-level field ({"region": ...}) as soon as its line is complete,
+    then one "result" with the same payload search_whiskey_info returns, or
+    one "error". Cached answers skip straight to the result.
+    """
+    cached = await whiskey_info_cache.get(query)
+    if cached is not None:
+        yield "result", cached
+        return
+
+    chunks: List[str] = []
+    line = ""
+    found: Set[str] = set()
+    try:
+        # aclosing: if our consumer stops early (client disconnect), the
+        # provider stream and its concurrency slot are released right away
+        # rather than whenever the generator is garbage collected
+        async with aclosing(
+            ai_client.stream_chat_completion(_whiskey_info_request(query))
+        ) as deltas:
+            async for delta in deltas:
+                yield "token", delta
+                chunks.append(delta)
+                *complete, line = (line + delta).split("\n")
+                for text in complete:
+                    for field, value in _line_fields(text).items():
+                        if field not in found:
+                            found.add(field)
+                            yield "field", {field: value}
+        result_data = parse_whiskey_info(query, "".join(chunks))
+    except Exception as e:
+        print(f"Error in AI service: {e}")
+        yield "error", dict(WHISKEY_INFO_ERROR)
+        return
+
+    await whiskey_info_cache.set(query, result_data)
+    yield "result", result_data
 
 
-def analyze_collection(
-    whiskeys: List[Whiskey], tastings: List[Tasting]
+async def analyze_collection(
+    user_whiskeys: List[UserWhiskey], tastings: List[Tasting]
 ) -> Dict[str, Any]:
-    """Analyze a user's whiskey collection and tastings"""
+    """
+    Analyze a user's whiskey collection and tastings.
+    Collection entries must have their whiskey loaded.
+    """
     try:
+        whiskeys = [user_whiskey.whiskey for user_whiskey in user_whiskeys]
         if not whiskeys:
             return {
                 "analysis": "אין מספיק נתונים לניתוח - "
@@ -157,12 +247,19 @@ def analyze_collection(
         if tastings:
             avg_rating = sum(t.rating for t in tastings) / len(tastings)
 
-        whiskey_ratings = {}
+        # Tastings belong to collection entries, not directly to whiskeys
+        whiskey_ids = {
+            user_whiskey.id: user_whiskey.whiskey_id for user_whiskey in user_whiskeys
+        }
+        whiskey_ratings: Dict[int, Dict[str, int]] = {}
         for tasting in tastings:
-            if tasting.whiskey_id not in whiskey_ratings:
-                whiskey_ratings[tasting.whiskey_id] = {"sum": 0, "count": 0}
-            whiskey_ratings[tasting.whiskey_id]["sum"] += tasting.rating
-            whiskey_ratings[tasting.whiskey_id]["count"] += 1
+            whiskey_id = whiskey_ids.get(tasting.user_whiskey_id)
+            if whiskey_id is None:
+                continue
+            if whiskey_id not in whiskey_ratings:
+                whiskey_ratings[whiskey_id] = {"sum": 0, "count": 0}
+            whiskey_ratings[whiskey_id]["sum"] += tasting.rating
+            whiskey_ratings[whiskey_id]["count"] += 1
 
         top_whiskeys = []
         for whiskey in whiskeys:
@@ -182,11 +279,11 @@ def analyze_collection(
         top_whiskeys_info = [
             f"{w.name} ({round(rating, 1)}/10)" for w, rating in top_whiskeys
         ]
-
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json",
-        }
+        types_text = ", ".join(set(whiskey_types)) if whiskey_types else "אין מידע"
+        regions_text = (
+            ", ".join(set(whiskey_regions)) if whiskey_regions else "אין מידע"
+        )
+        top_text = ", ".join(top_whiskeys_info) if top_whiskeys_info else "אין דירוגים"
 
         data = {
             "model": "gpt-4",
@@ -207,12 +304,9 @@ def analyze_collection(
                     "content": (
                         f"נתח את אוסף הוויסקי הבא וספק תובנות והמלצות:\n\n"
                         f"מספר ויסקי באוסף: {len(whiskeys)}\n"
-                        f"סוגי ויסקי באוסף: {', '.join(set(whiskey_types)) if
-                                             whiskey_types else 'אין מידע'}\n"
-                        f"אזורים באוסף: {', '.join(set(whiskey_regions)) if
-                                         whiskey_regions else 'אין מידע'}\n"
-                        f"ויסקי מדורגים בראש: {', '.join(top_whiskeys_info) if
-                                               top_whiskeys_info else 'אין דירוגים'}\n"
+                        f"סוגי ויסקי באוסף: {types_text}\n"
+                        f"אזורים באוסף: {regions_text}\n"
+                        f"ויסקי מדורגים בראש: {top_text}\n"
                         f"דירוג ממוצע: {round(avg_rating, 1)}/10"
                     ),
                 },
@@ -221,13 +315,7 @@ def analyze_collection(
             "temperature": 0.7,
         }
 
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions", headers=headers, json=data
-        )
-        response.raise_for_status()
-
-        result = response.json()
-        content = result["choices"][0]["message"]["content"]
+        content = await ai_client.chat_completion(data)
 
         try:
             analysis = json.loads(content)
@@ -0,0 +1,337 @@
+import asyncio
+import os
+from collections.abc import AsyncGenerator
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.db.database import async_session
+from app.models.analysis_job import AnalysisJob as AnalysisJobModel
+from app.models.tasting import Tasting as TastingModel
+from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.services.ai_service import analyze_collection
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+ANALYSIS_QUEUE_SIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", "100"))
+
+# A job still pending or running after this long (seconds) was lost, e.g.
+# to a restart; the AI client's own timeouts end a real run well before
+ANALYSIS_JOB_TIMEOUT = 600
+
+# Streams re-read the job at least this often (seconds), which also picks
+# up jobs run by another worker process, and give up after the timeout
+ANALYSIS_STREAM_POLL_INTERVAL = 2.0
+ANALYSIS_STREAM_TIMEOUT = 300.0
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class AnalysisQueue:
+    """
+    Bounded in-process queue of analysis job ids, drained by a fixed pool of
+    worker tasks, so at most `workers` analyses run at once per process and
+    requests only pay for the insert.
+    Job rows are the source of truth; the queue only says what to run next.
+    """
+
+    def __init__(self, workers: int, maxsize: int) -> None:
+        self.workers = workers
+        self._queue: asyncio.Queue[int] = asyncio.Queue(maxsize)
+        self._tasks: list[asyncio.Task[None]] = []
+        self._updates: dict[int, asyncio.Event] = {}
+        self._waiters: dict[int, int] = {}
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def full(self) -> bool:
+        return self._queue.full()
+
+    def submit(self, job_id: int) -> bool:
+        try:
+            self._queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def notify(self, job_id: int) -> None:
+        event = self._updates.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_update(self, job_id: int, timeout: float) -> None:
+        """
+        Wait until the job changes in this process, or for the timeout.
+        """
+        event = self._updates.setdefault(job_id, asyncio.Event())
+        self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # Jobs finished elsewhere are never notified here; drop the
+            # event with its last waiter so it doesn't pile up
+            self._waiters[job_id] -= 1
+            if not self._waiters[job_id]:
+                del self._waiters[job_id]
+                self._updates.pop(job_id, None)
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await run_analysis_job(job_id)
+            except Exception as e:
+                # Keep the worker alive whatever went wrong, and don't leave
+                # the job pending or running until it times out
+                print(f"Analysis job {job_id} could not be run: {e}")
+                await fail_analysis_job(job_id, "Analysis could not be run")
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "maxsize": self._queue.maxsize,
+        }
+
+
+analysis_queue = AnalysisQueue(ANALYSIS_WORKERS, ANALYSIS_QUEUE_SIZE)
+
+
+async def get_analysis_job(
+    db: AsyncSession, job_id: int, user_id: int
+) -> Optional[AnalysisJobModel]:
+    result = await db.execute(
+        select(AnalysisJobModel).where(
+            AnalysisJobModel.id == job_id, AnalysisJobModel.user_id == user_id
+        )
+    )
+    return result.scalars().first()
+
+
+async def _active_job(db: AsyncSession, user_id: int) -> Optional[AnalysisJobModel]:
+    result = await db.execute(
+        select(AnalysisJobModel)
+        .where(
+            AnalysisJobModel.user_id == user_id,
+            AnalysisJobModel.status.in_(ACTIVE_STATUSES),
+        )
+        .order_by(AnalysisJobModel.id.desc())
+    )
+    return result.scalars().first()
+
+
+async def submit_analysis_job(
+    db: AsyncSession, user_id: int
+) -> Optional[AnalysisJobModel]:
+    """
+    Queue an analysis of the user's collection and return its job.
+    A user with a job still pending or running gets that job back.
+    Returns None when the queue is full.
+    The job is committed before it is queued, so a worker always finds it.
+    A unique index allows one active job per user; a concurrent submit that
+    loses the race gets the winner's job.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ANALYSIS_JOB_TIMEOUT)
+    await db.execute(
+        update(AnalysisJobModel)
+        .where(
+            AnalysisJobModel.user_id == user_id,
+            AnalysisJobModel.status.in_(ACTIVE_STATUSES),
+            AnalysisJobModel.created_date <= cutoff,
+        )
+        .values(status="failed", error="Analysis was interrupted")
+    )
+    active = await _active_job(db, user_id)
+    if active is not None:
+        return active
+    if analysis_queue.full():
+        return None
+
+    job = AnalysisJobModel(user_id=user_id, status="pending")
+    try:
+        async with db.begin_nested():
+            db.add(job)
+    except IntegrityError:
+        return await _active_job(db, user_id)
+    await db.commit()
+    if not analysis_queue.submit(job.id):
+        job.status = "failed"
+        job.error = "Analysis queue is full"
+        await db.commit()
+        return None
+    return job
+
+
+async def fail_analysis_job(job_id: int, error: str) -> None:
+    """
+    Mark a job failed unless it already finished. Best effort: when even
+    this fails, the job is reported as interrupted once it times out.
+    """
+    try:
+        async with async_session() as db:
+            await db.execute(
+                update(AnalysisJobModel)
+                .where(
+                    AnalysisJobModel.id == job_id,
+                    AnalysisJobModel.status.in_(ACTIVE_STATUSES),
+                )
+                .values(
+                    status="failed",
+                    error=error,
+                    finished_date=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+    except (SQLAlchemyError, OSError) as e:
+        print(f"Analysis job {job_id} could not be marked failed: {e}")
+    analysis_queue.notify(job_id)
+
+
+async def recover_analysis_jobs() -> None:
+    """
+    Queue the jobs a restart left pending, oldest first. Those older than
+    ANALYSIS_JOB_TIMEOUT, or that no longer fit in the queue, are failed.
+    Other processes may queue the same jobs; run_analysis_job claims a job
+    atomically, so each still runs once.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ANALYSIS_JOB_TIMEOUT)
+    try:
+        async with async_session() as db:
+            await db.execute(
+                update(AnalysisJobModel)
+                .where(
+                    AnalysisJobModel.status == "pending",
+                    AnalysisJobModel.created_date <= cutoff,
+                )
+                .values(status="failed", error="Analysis was interrupted")
+            )
+            await db.commit()
+            job_ids = list(
+                (
+                    await db.execute(
+                        select(AnalysisJobModel.id)
+                        .where(AnalysisJobModel.status == "pending")
+                        .order_by(AnalysisJobModel.id)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+    except (SQLAlchemyError, OSError) as e:
+        print(f"Pending analysis jobs could not be recovered: {e}")
+        return
+    for job_id in job_ids:
+        if not analysis_queue.submit(job_id):
+            await fail_analysis_job(job_id, "Analysis queue is full")
+    if job_ids:
+        print(f"Recovered {len(job_ids)} pending analysis jobs.")
+
+
+async def run_analysis_job(job_id: int) -> None:
+    """
+    Run one job. The job is claimed and the collection loaded in one short
+    transaction; no connection is held during the AI call.
+    Claiming flips pending to running in a single UPDATE, so a job queued
+    twice (e.g. by recovery in several processes) only runs once.
+    """
+    async with async_session() as db:
+        user_id = (
+            await db.execute(
+                update(AnalysisJobModel)
+                .where(
+                    AnalysisJobModel.id == job_id,
+                    AnalysisJobModel.status == "pending",
+                )
+                .values(status="running", started_date=datetime.now(timezone.utc))
+                .returning(AnalysisJobModel.user_id)
+            )
+        ).scalar_one_or_none()
+        if user_id is None:
+            return
+        user_whiskeys = list(
+            (
+                await db.execute(
+                    select(UserWhiskeyModel)
+                    .where(UserWhiskeyModel.user_id == user_id)
+                    .options(selectinload(UserWhiskeyModel.whiskey))
+                )
+            )
+            .scalars()
+            .all()
+        )
+        tastings = list(
+            (
+                await db.execute(
+                    select(TastingModel).where(TastingModel.user_id == user_id)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        await db.commit()
+    analysis_queue.notify(job_id)
+
+    status, result, error = "completed", None, None
+    try:
+        result = await analyze_collection(user_whiskeys, tastings)
+    except Exception as e:
+        # analyze_collection has its own fallbacks; this is a bug, keep the
+        # worker alive and report it on the job
+        print(f"Analysis job {job_id} failed: {e}")
+        status, error = "failed", str(e)
+
+    async with async_session() as db:
+        job = await db.get(AnalysisJobModel, job_id)
+        if job is not None:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_date = datetime.now(timezone.utc)
+            await db.commit()
+    analysis_queue.notify(job_id)
+
+
+async def watch_analysis_job(
+    job_id: int, user_id: int
+) -> AsyncGenerator[AnalysisJobModel, None]:
+    """
+    Yield the job whenever its status changes, until it is finished or
+    ANALYSIS_STREAM_TIMEOUT passes. Each read uses a short-lived session so
+    a waiting stream holds no connection.
+    """
+    deadline = asyncio.get_running_loop().time() + ANALYSIS_STREAM_TIMEOUT
+    last_status = None
+    while True:
+        async with async_session() as db:
+            job = await get_analysis_job(db, job_id, user_id)
+        if job is None:
+            return
+        if job.status != last_status:
+            last_status = job.status
+            yield job
+        if job.status not in ACTIVE_STATUSES:
+            return
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            return
+        await analysis_queue.wait_for_update(
+            job_id, min(ANALYSIS_STREAM_POLL_INTERVAL, remaining)
+        )
@@ -0,0 +1,280 @@
+import asyncio
+import heapq
+import os
+from bisect import bisect_left
+from bisect import insort
+from collections.abc import Iterable
+from datetime import datetime
+from datetime import timezone
+from typing import Literal
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db.database import read_sessionmaker
+from app.models.distillery import Distillery as DistilleryModel
+from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.models.whiskey import Whiskey as WhiskeyModel
+from app.schemas.search_schema import Suggestion
+from app.utils.text import normalize
+
+AUTOCOMPLETE_REFRESH_INTERVAL = int(os.getenv("AUTOCOMPLETE_REFRESH_INTERVAL", "3600"))
+AUTOCOMPLETE_MAX_RESULTS = 20
+
+# Prefixes this short match a large share of the catalog, so their matches
+# are kept in rank order instead of being ranked per keystroke
+SHORT_PREFIX_LENGTH = 2
+
+SuggestionKind = Literal["whiskey", "distillery"]
+EntryKey = tuple[SuggestionKind, int]
+# Most popular first, then by name
+RankKey = tuple[int, str, SuggestionKind, int]
+
+
+def _keys(name: str) -> list[str]:
+    """
+    Keys a name is found by: itself and every tail starting at a word, so
+    "Ardbeg Uigeadail" is found by "ard" and by "uig".
+    """
+    words = normalize(name).split()
+    return [" ".join(words[start:]) for start in range(len(words))]
+
+
+class _Entry:
+    def __init__(
+        self,
+        kind: SuggestionKind,
+        id: int,
+        name: str,
+        popularity: int = 0,
+        distillery_id: Optional[int] = None,
+    ) -> None:
+        self.kind = kind
+        self.id = id
+        self.name = name
+        self.popularity = popularity
+        self.distillery_id = distillery_id
+
+    @property
+    def key(self) -> EntryKey:
+        return (self.kind, self.id)
+
+    @property
+    def rank(self) -> RankKey:
+        return (-self.popularity, self.name, self.kind, self.id)
+
+    def short_prefixes(self) -> set[str]:
+        return {
+            key[:length]
+            for key in _keys(self.name)
+            for length in range(1, min(len(key), SHORT_PREFIX_LENGTH) + 1)
+        }
+
+
+class AutocompleteIndex:
+    """
+    Whiskey and distillery names in a sorted array of normalized keys, so a
+    prefix is a bisect plus a scan of its matches. The matches of each short
+    prefix are kept sorted by rank, so a change moves one entry within its
+    buckets instead of re-ranking them.
+    Popularity is the number of collections holding the whiskey, or any of
+    the distillery's whiskeys.
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[EntryKey, _Entry] = {}
+        self._keys: list[tuple[str, SuggestionKind, int]] = []
+        self._buckets: dict[str, list[RankKey]] = {}
+        self.built_at: Optional[datetime] = None
+
+    @classmethod
+    def build(cls, entries: Iterable[_Entry]) -> "AutocompleteIndex":
+        index = cls()
+        for entry in entries:
+            index._entries[entry.key] = entry
+            index._keys.extend((key, entry.kind, entry.id) for key in _keys(entry.name))
+            for prefix in entry.short_prefixes():
+                index._buckets.setdefault(prefix, []).append(entry.rank)
+        index._keys.sort()
+        for bucket in index._buckets.values():
+            bucket.sort()
+        index.built_at = datetime.now(timezone.utc)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _matches(self, prefix: str) -> set[EntryKey]:
+        found: set[EntryKey] = set()
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+            _, kind, id = self._keys[position]
+            found.add((kind, id))
+            position += 1
+        return found
+
+    def _rank(self, prefix: str, limit: int) -> list[_Entry]:
+        return heapq.nsmallest(
+            limit,
+            (self._entries[key] for key in self._matches(prefix)),
+            key=lambda entry: entry.rank,
+        )
+
+    def _rerank(self, entry: _Entry) -> None:
+        for prefix in entry.short_prefixes():
+            insort(self._buckets.setdefault(prefix, []), entry.rank)
+
+    def _unrank(self, entry: _Entry) -> None:
+        """
+        Take the entry out of its buckets; call before changing its name or
+        popularity.
+        """
+        rank = entry.rank
+        for prefix in entry.short_prefixes():
+            bucket = self._buckets.get(prefix, [])
+            position = bisect_left(bucket, rank)
+            if position < len(bucket) and bucket[position] == rank:
+                del bucket[position]
+            if not bucket:
+                self._buckets.pop(prefix, None)
+
+    def search(self, query: str, limit: int = 10) -> list[_Entry]:
+        """
+        The most popular names with a word starting with the query.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX_LENGTH:
+            return [
+                self._entries[(kind, id)]
+                for _, _, kind, id in self._buckets.get(prefix, [])[:limit]
+            ]
+        return self._rank(prefix, limit)
+
+    def add(self, entry: _Entry) -> None:
+        """
+        Add or replace an entry; a replaced entry keeps its popularity.
+        """
+        previous = self.remove(entry.kind, entry.id)
+        if previous is not None:
+            entry.popularity = previous.popularity
+        self._entries[entry.key] = entry
+        for key in _keys(entry.name):
+            insort(self._keys, (key, entry.kind, entry.id))
+        self._rerank(entry)
+
+    def remove(self, kind: SuggestionKind, id: int) -> Optional[_Entry]:
+        entry = self._entries.get((kind, id))
+        if entry is None:
+            return None
+        for key in _keys(entry.name):
+            position = bisect_left(self._keys, (key, kind, id))
+            if position < len(self._keys) and self._keys[position] == (key, kind, id):
+                del self._keys[position]
+        del self._entries[entry.key]
+        self._unrank(entry)
+        return entry
+
+    def adjust_popularity(self, kind: SuggestionKind, id: int, delta: int) -> None:
+        entry = self._entries.get((kind, id))
+        if entry is None:
+            return
+        self._unrank(entry)
+        entry.popularity = max(entry.popularity + delta, 0)
+        self._rerank(entry)
+
+    def get(self, kind: SuggestionKind, id: int) -> Optional[_Entry]:
+        return self._entries.get((kind, id))
+
+    def detach_distillery(self, distillery_id: int) -> None:
+        for entry in self._entries.values():
+            if entry.kind == "whiskey" and entry.distillery_id == distillery_id:
+                entry.distillery_id = None
+
+
+index = AutocompleteIndex()
+
+
+async def rebuild_index() -> None:
+    """
+    Build a fresh index from the database and swap it in.
+    """
+    global index
+    async with read_sessionmaker()() as db:
+        whiskeys = (
+            await db.execute(
+                select(
+                    WhiskeyModel.id,
+                    WhiskeyModel.name,
+                    WhiskeyModel.distillery_id,
+                    func.count(UserWhiskeyModel.id),
+                )
+                .outerjoin(WhiskeyModel.user_whiskeys)
+                .group_by(WhiskeyModel.id)
+            )
+        ).all()
+        distilleries = (
+            await db.execute(select(DistilleryModel.id, DistilleryModel.name))
+        ).all()
+
+    entries = [
+        _Entry("whiskey", id, name, popularity, distillery_id)
+        for id, name, distillery_id, popularity in whiskeys
+    ]
+    distillery_popularity: dict[int, int] = {}
+    for entry in entries:
+        if entry.distillery_id is not None:
+            distillery_popularity[entry.distillery_id] = (
+                distillery_popularity.get(entry.distillery_id, 0) + entry.popularity
+            )
+    entries.extend(
+        _Entry("distillery", id, name, distillery_popularity.get(id, 0))
+        for id, name in distilleries
+    )
+    index = AutocompleteIndex.build(entries)
+
+
+async def rebuild_index_periodically(interval: int) -> None:
+    """
+    Build the index at startup, then rebuild it now and then to pick up
+    catalog changes made outside the API and to correct any drift from
+    incremental updates of requests that were rolled back.
+    Each worker process keeps its own.
+    """
+    while True:
+        try:
+            await rebuild_index()
+        except (SQLAlchemyError, OSError) as e:
+            print(f"Could not rebuild the autocomplete index: {e}")
+        await asyncio.sleep(interval)
+
+
+def index_distillery(distillery: DistilleryModel) -> None:
+    index.add(_Entry("distillery", distillery.id, distillery.name))
+
+
+def unindex_distillery(distillery_id: int) -> None:
+    index.remove("distillery", distillery_id)
+    index.detach_distillery(distillery_id)
+
+
+def record_collection_change(whiskey_ids: Iterable[int], delta: int) -> None:
+    """
+    Bottles were added to (delta 1) or removed from (delta -1) a collection.
+    """
+    for whiskey_id in whiskey_ids:
+        index.adjust_popularity("whiskey", whiskey_id, delta)
+        whiskey = index.get("whiskey", whiskey_id)
+        if whiskey is not None and whiskey.distillery_id is not None:
+            index.adjust_popularity("distillery", whiskey.distillery_id, delta)
+
+
+def autocomplete(query: str, limit: int = 10) -> list[Suggestion]:
+    return [
+        Suggestion(type=entry.kind, id=entry.id, name=entry.name)
+        for entry in index.search(query, limit)
+    ]
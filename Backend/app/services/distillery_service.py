@@ -1,12 +1,30 @@
 from typing import List
+from typing import Literal
 from typing import Optional
 
+from sqlalchemy import delete
+from sqlalchemy import insert
 from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.distillery import Distillery as DistilleryModel
+from app.models.whiskey import Whiskey as WhiskeyModel
 from app.schemas.distillery_schema import DistilleryCreate
 from app.schemas.distillery_schema import DistilleryUpdate
+from app.services.autocomplete_service import index_distillery
+from app.services.autocomplete_service import unindex_distillery
+from app.services.stats_service import invalidate_stats_for_whiskeys
+from app.utils.pagination import Cursor
+from app.utils.pagination import column_sort_key
+from app.utils.pagination import paginate
+
+DistillerySort = Literal["name", "created_date"]
+
+DISTILLERY_SORT_KEYS = {
+    "name": column_sort_key(DistilleryModel.name),
+    "created_date": column_sort_key(DistilleryModel.created_date),
+}
 
 
 async def get_distillery(
@@ -14,12 +32,9 @@ async def get_distillery(
 ) -> Optional[DistilleryModel]:
     """
     Retrieve a single distillery by its ID.
-    Uses FOR UPDATE to ensure safe concurrent access.
     """
     result = await db.execute(
-        select(DistilleryModel)
-        .where(DistilleryModel.id == distillery_id)
-        .with_for_update()
+        select(DistilleryModel).where(DistilleryModel.id == distillery_id)
     )
     return result.scalars().first()
 
@@ -37,12 +52,27 @@ async def get_distillery_by_name(
 
 
 async def get_distilleries(
-    db: AsyncSession, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    sort: DistillerySort = "name",
+    descending: bool = False,
 ) -> List[DistilleryModel]:
     """
     Retrieve a list of distilleries with pagination.
     """
-    result = await db.execute(select(DistilleryModel).offset(skip).limit(limit))
+    result = await db.execute(
+        paginate(
+            select(DistilleryModel),
+            DISTILLERY_SORT_KEYS[sort],
+            DistilleryModel.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            descending=descending,
+        )
+    )
     return list(result.scalars().all())
 
 
@@ -52,10 +82,11 @@ async def create_distillery(
     """
     Create a new distillery.
     """
-    db_distillery = DistilleryModel(**distillery.dict())
-    db.add(db_distillery)
-    await db.flush()
-    await db.refresh(db_distillery)
+    result = await db.execute(
+        insert(DistilleryModel).values(**distillery.dict()).returning(DistilleryModel)
+    )
+    db_distillery = result.scalar_one()
+    index_distillery(db_distillery)
     return db_distillery
 
 
@@ -65,16 +96,19 @@ async def update_distillery(
     """
     Update an existing distillery by ID.
     """
-    db_distillery = await get_distillery(db, distillery_id)
-    if not db_distillery:
-        return None
-
     update_data = distillery_update_data.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_distillery, key, value)
+    if not update_data:
+        return await get_distillery(db, distillery_id)
 
-    await db.flush()
-    await db.refresh(db_distillery)
+    result = await db.execute(
+        update(DistilleryModel)
+        .where(DistilleryModel.id == distillery_id)
+        .values(**update_data)
+        .returning(DistilleryModel)
+    )
+    db_distillery = result.scalars().first()
+    if db_distillery is not None and "name" in update_data:
+        index_distillery(db_distillery)
     return db_distillery
 
 
@@ -83,14 +117,20 @@ async def delete_distillery(
 ) -> Optional[DistilleryModel]:
     """
     Delete a distillery.
-    Note: Consider handling linked whiskeys (e.g., restrict delete or nullify).
-    # TODO: what if whiskeys are linked to this distillery?
-    # want to prevent deletion or handle it - set whiskey.distillery_id to null).
+    Whiskeys linked to it are kept and their distillery_id is set to null.
     """
-    db_distillery = await get_distillery(db, distillery_id)
-    if not db_distillery:
-        return None
-
-    await db.delete(db_distillery)
-    await db.flush()
+    await invalidate_stats_for_whiskeys(db, WhiskeyModel.distillery_id == distillery_id)
+    await db.execute(
+        update(WhiskeyModel)
+        .where(WhiskeyModel.distillery_id == distillery_id)
+        .values(distillery_id=None)
+    )
+    result = await db.execute(
+        delete(DistilleryModel)
+        .where(DistilleryModel.id == distillery_id)
+        .returning(DistilleryModel)
+    )
+    db_distillery = result.scalars().first()
+    if db_distillery is not None:
+        unindex_distillery(distillery_id)
     return db_distillery
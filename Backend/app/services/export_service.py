@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+import os
+from collections.abc import AsyncIterator
+from datetime import date
+from datetime import datetime
+from typing import Any
+from typing import Literal
+
+from sqlalchemy import Select
+from sqlalchemy import select
+
+from app.db.database import read_sessionmaker
+from app.models.distillery import Distillery as DistilleryModel
+from app.models.tasting import Tasting as TastingModel
+from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.models.whiskey import Whiskey as WhiskeyModel
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def tastings_query(user_id: int) -> Select[Any]:
+    return (
+        select(*TastingModel.__table__.columns)
+        .where(TastingModel.user_id == user_id)
+        .order_by(TastingModel.tasting_date, TastingModel.id)
+    )
+
+
+def user_whiskeys_query(user_id: int) -> Select[Any]:
+    """
+    One flat row per collection entry, with the whiskey and distillery inlined.
+    """
+    columns: list[Any] = [
+        UserWhiskeyModel.id,
+        UserWhiskeyModel.whiskey_id,
+        UserWhiskeyModel.is_owned,
+        UserWhiskeyModel.is_favorite,
+        UserWhiskeyModel.created_date,
+        WhiskeyModel.name,
+        DistilleryModel.name.label("distillery"),
+        WhiskeyModel.region,
+        WhiskeyModel.type,
+        WhiskeyModel.age,
+        WhiskeyModel.abv,
+        WhiskeyModel.price,
+        WhiskeyModel.bottle_status_percent,
+        WhiskeyModel.notes,
+    ]
+    return (
+        select(*columns)
+        .join(UserWhiskeyModel.whiskey)
+        .outerjoin(WhiskeyModel.distillery_info)
+        .where(UserWhiskeyModel.user_id == user_id)
+        .order_by(UserWhiskeyModel.created_date, UserWhiskeyModel.id)
+    )
+
+
+def distilleries_query() -> Select[Any]:
+    return select(*DistilleryModel.__table__.columns).order_by(DistilleryModel.id)
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
+
+
+async def stream_export(stmt: Select[Any], fmt: ExportFormat) -> AsyncIterator[str]:
+    """
+    Stream the rows of `stmt` as NDJSON or CSV.
+
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE and are
+    written out as they arrive, so memory stays flat however large the export.
+    The generator owns its session: request-scoped dependencies are closed
+    before a streaming body is sent.
+    """
+    async with read_sessionmaker()() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(result.keys())
+            async for partition in result.partitions():
+                writer.writerows(partition)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        else:
+            async for partition in result.mappings().partitions():
+                yield "".join(
+                    json.dumps(dict(row), default=_json_default) + "\n"
+                    for row in partition
+                )
@@ -0,0 +1,205 @@
+import csv
+import json
+import os
+from collections.abc import Iterator
+from itertools import islice
+from typing import IO
+from typing import Any
+from typing import Literal
+from typing import Optional
+
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tasting import Tasting as TastingModel
+from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.models.whiskey import Whiskey as WhiskeyModel
+from app.schemas.tasting_schema import TastingCreate
+from app.schemas.tasting_schema import TastingImportError
+from app.schemas.tasting_schema import TastingImportResult
+from app.services.stats_service import apply_tasting_delta
+from app.services.stats_service import apply_whiskey_rating_deltas
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# Rows validated and inserted per transaction
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+
+# Spreadsheets rarely know collection ids, so rows may name the whiskey instead
+WHISKEY_NAME_FIELD = "whiskey_name"
+
+# Errors after which the rest of the file can't be read reliably
+UNREADABLE_FILE_ERRORS = (UnicodeDecodeError, csv.Error)
+
+
+def _read_rows(file: IO[bytes], fmt: ImportFormat) -> Iterator[Any]:
+    """
+    Yield raw rows one at a time; malformed NDJSON lines are yielded as the
+    exception so they are reported against their row number. A file that
+    stops being readable (not UTF-8, broken CSV) yields the error once and
+    ends there.
+    """
+    # Decoded per line, so an invalid byte only stops the file at its row
+    text = (
+        line.decode("utf-8-sig" if number == 0 else "utf-8")
+        for number, line in enumerate(file)
+    )
+    try:
+        if fmt == "csv":
+            for row in csv.DictReader(text):
+                # Empty spreadsheet cells mean "not set", not an empty string
+                yield {key: value or None for key, value in row.items() if key}
+            return
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield e
+    except UNREADABLE_FILE_ERRORS as e:
+        yield e
+
+
+async def _resolve_user_whiskeys(
+    db: AsyncSession, rows: list[dict[str, Any]], user_id: int
+) -> None:
+    """
+    Fill in user_whiskey_id from whiskey_name and drop ids the user does not
+    own, with one query per chunk for each.
+    """
+    names = {
+        str(row[WHISKEY_NAME_FIELD]).strip().lower()
+        for row in rows
+        if not row.get("user_whiskey_id") and row.get(WHISKEY_NAME_FIELD)
+    }
+    if names:
+        result = await db.execute(
+            select(func.lower(WhiskeyModel.name), UserWhiskeyModel.id)
+            .join(UserWhiskeyModel.whiskey)
+            .where(
+                UserWhiskeyModel.user_id == user_id,
+                func.lower(WhiskeyModel.name).in_(names),
+            )
+        )
+        by_name: dict[str, int] = dict(result.tuples().all())
+        for row in rows:
+            if not row.get("user_whiskey_id") and row.get(WHISKEY_NAME_FIELD):
+                name = str(row[WHISKEY_NAME_FIELD]).strip().lower()
+                row["user_whiskey_id"] = by_name.get(name)
+
+    ids = set()
+    for row in rows:
+        try:
+            ids.add(int(row["user_whiskey_id"]))
+        except (KeyError, TypeError, ValueError):
+            pass
+    if not ids:
+        return
+    result = await db.execute(
+        select(UserWhiskeyModel.id).where(
+            UserWhiskeyModel.user_id == user_id, UserWhiskeyModel.id.in_(ids)
+        )
+    )
+    owned = set(result.scalars().all())
+    for row in rows:
+        try:
+            if int(row["user_whiskey_id"]) not in owned:
+                row["user_whiskey_id"] = None
+        except (KeyError, TypeError, ValueError):
+            pass
+
+
+async def _import_chunk(
+    db: AsyncSession,
+    chunk: list[tuple[int, Any]],
+    user_id: int,
+    result: TastingImportResult,
+) -> None:
+    rows = [(number, raw) for number, raw in chunk if isinstance(raw, dict)]
+    for number, raw in chunk:
+        if isinstance(raw, UNREADABLE_FILE_ERRORS):
+            result.errors.append(
+                TastingImportError(
+                    row=number,
+                    error=f"File could not be read from here on: {raw}",
+                )
+            )
+        elif isinstance(raw, ValueError):
+            result.errors.append(
+                TastingImportError(row=number, error=f"Invalid JSON: {raw}")
+            )
+        elif not isinstance(raw, dict):
+            result.errors.append(
+                TastingImportError(row=number, error="Row is not a JSON object")
+            )
+    await _resolve_user_whiskeys(db, [raw for _, raw in rows], user_id)
+
+    values = []
+    for number, raw in rows:
+        if raw.get("user_whiskey_id") is None:
+            result.errors.append(
+                TastingImportError(
+                    row=number, error="Whiskey not found in your collection"
+                )
+            )
+            continue
+        try:
+            tasting = TastingCreate(**raw)
+        except ValidationError as e:
+            error = "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+            )
+            result.errors.append(TastingImportError(row=number, error=error))
+            continue
+        values.append((number, {**tasting.dict(), "user_id": user_id}))
+
+    if not values:
+        return
+    try:
+        # executemany is sent as multi-row INSERT statements by SQLAlchemy
+        await db.execute(insert(TastingModel), [row for _, row in values])
+        await apply_tasting_delta(
+            db, user_id, len(values), sum(row["rating"] for _, row in values)
+        )
+        await apply_whiskey_rating_deltas(
+            db, [(row["user_whiskey_id"], 1, row["rating"]) for _, row in values]
+        )
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        for number, _ in values:
+            result.errors.append(
+                TastingImportError(row=number, error=f"Insert failed: {e}")
+            )
+        return
+    result.imported += len(values)
+
+
+async def import_tastings(
+    db: AsyncSession, file: IO[bytes], fmt: ImportFormat, user_id: int
+) -> Optional[TastingImportResult]:
+    """
+    Import tastings from a CSV or NDJSON upload.
+
+    Rows are processed in chunks of IMPORT_CHUNK_SIZE, each committed in its
+    own transaction, so a bad row (or a failed chunk) is reported without
+    discarding the rest of the file. Rows reference the bottle either by
+    user_whiskey_id or by whiskey_name within the user's collection.
+    Returns None if the file can't be read at all; a file that breaks off
+    later is reported against the row where reading stopped.
+    """
+    result = TastingImportResult(imported=0, failed=0, errors=[])
+    rows = enumerate(_read_rows(file, fmt), start=1)
+    while chunk := list(islice(rows, IMPORT_CHUNK_SIZE)):
+        number, raw = chunk[0]
+        if number == 1 and isinstance(raw, UNREADABLE_FILE_ERRORS):
+            return None
+        await _import_chunk(db, chunk, user_id, result)
+    result.errors.sort(key=lambda error: error.row)
+    result.failed = len(result.errors)
+    return result
@@ -0,0 +1,220 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import read_sessionmaker
+from app.models.tasting import Tasting as TastingModel
+from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.schemas.recommendation_schema import Recommendation
+from app.schemas.search_schema import WhiskeySearchResult
+from app.services.search_service import get_catalog_whiskeys
+from app.services.trending_service import get_trending
+
+RECOMMENDER_REBUILD_INTERVAL = int(os.getenv("RECOMMENDER_REBUILD_INTERVAL", "900"))
+RECOMMENDER_NEIGHBORS = int(os.getenv("RECOMMENDER_NEIGHBORS", "20"))
+
+# Interest for a bottle in the collection that was never tasted, on the
+# 1-10 rating scale; favorites get a bonus on top of their rating.
+UNTASTED_INTEREST = 5.0
+FAVORITE_BONUS = 2.0
+
+Neighbors = dict[int, list[tuple[int, float]]]
+
+
+class RecommenderIndex:
+    """
+    Top-K most similar whiskeys per whiskey, replaced wholesale on rebuild.
+    """
+
+    def __init__(self) -> None:
+        self.neighbors: Neighbors = {}
+        self.built_at: Optional[datetime] = None
+
+
+index = RecommenderIndex()
+
+
+def _interest(is_favorite: bool, avg_rating: Optional[float]) -> float:
+    value = float(avg_rating) if avg_rating is not None else UNTASTED_INTEREST
+    if is_favorite:
+        value += FAVORITE_BONUS
+    return min(value, 10.0)
+
+
+def _interest_query() -> Any:
+    """
+    One row per collection entry: user, whiskey, favorite flag and the
+    user's average rating of it (NULL when never tasted).
+    """
+    return (
+        select(
+            UserWhiskeyModel.user_id,
+            UserWhiskeyModel.whiskey_id,
+            UserWhiskeyModel.is_favorite,
+            func.avg(TastingModel.rating),
+        )
+        .outerjoin(UserWhiskeyModel.tastings)
+        .group_by(
+            UserWhiskeyModel.id,
+            UserWhiskeyModel.user_id,
+            UserWhiskeyModel.whiskey_id,
+            UserWhiskeyModel.is_favorite,
+        )
+    )
+
+
+def build_neighbors(
+    users: list[int], whiskeys: list[int], values: list[float], k: int
+) -> Neighbors:
+    """
+    Cosine similarity between whiskey columns of the sparse user x whiskey
+    interest matrix, keeping the k most similar whiskeys of each.
+    CPU bound: run it off the event loop.
+    """
+    if not values:
+        return {}
+    user_ids, user_index = np.unique(np.asarray(users), return_inverse=True)
+    whiskey_ids, whiskey_index = np.unique(np.asarray(whiskeys), return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float64), (user_index, whiskey_index)),
+        shape=(len(user_ids), len(whiskey_ids)),
+    )
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0))).ravel()
+    norms[norms == 0] = 1.0
+    normalized = matrix @ sparse.diags(1.0 / norms)
+    similarity = (normalized.T @ normalized).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    neighbors: Neighbors = {}
+    for row in range(similarity.shape[0]):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        if start == end:
+            continue
+        columns = similarity.indices[start:end]
+        scores = similarity.data[start:end]
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+            columns, scores = columns[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        neighbors[int(whiskey_ids[row])] = [
+            (int(whiskey_ids[column]), float(score))
+            for column, score in zip(columns[order], scores[order])
+        ]
+    return neighbors
+
+
+async def rebuild_index() -> None:
+    async with read_sessionmaker()() as db:
+        rows = (await db.execute(_interest_query())).all()
+    users = [row[0] for row in rows]
+    whiskeys = [row[1] for row in rows]
+    values = [_interest(row[2], row[3]) for row in rows]
+    neighbors = await asyncio.to_thread(
+        build_neighbors, users, whiskeys, values, RECOMMENDER_NEIGHBORS
+    )
+    index.neighbors = neighbors
+    index.built_at = datetime.now(timezone.utc)
+
+
+async def rebuild_index_periodically(interval: int) -> None:
+    """
+    Keep the similarity index current. Each worker process keeps its own.
+    """
+    while True:
+        try:
+            await rebuild_index()
+        except (SQLAlchemyError, OSError) as e:
+            print(f"Could not rebuild the recommender index: {e}")
+        await asyncio.sleep(interval)
+
+
+async def recommend_for_user(
+    db: AsyncSession, user_id: int, limit: int = 10
+) -> list[Recommendation]:
+    """
+    Score whiskeys outside the user's collection by their similarity to the
+    bottles the user likes, weighted by how much they like them.
+    Falls back to trending whiskeys for users without usable history.
+    """
+    rows = (
+        await db.execute(_interest_query().where(UserWhiskeyModel.user_id == user_id))
+    ).all()
+    interests = {row[1]: _interest(row[2], row[3]) for row in rows}
+
+    weighted: dict[int, float] = defaultdict(float)
+    because: dict[int, list[tuple[float, int]]] = defaultdict(list)
+    for whiskey_id, interest in interests.items():
+        for candidate, similarity in index.neighbors.get(whiskey_id, []):
+            if candidate in interests:
+                continue
+            weighted[candidate] += similarity * interest
+            because[candidate].append((similarity * interest, whiskey_id))
+
+    ranked = sorted(
+        weighted, key=lambda whiskey_id: (-weighted[whiskey_id], whiskey_id)
+    )
+    ranked = ranked[:limit]
+    if not ranked:
+        return await _trending_recommendations(db, set(interests), limit)
+
+    # Confidence: interest-weighted mean similarity to the whole collection
+    total_interest = sum(interests.values())
+    catalog = await get_catalog_whiskeys(db, ranked + list(interests))
+    recommendations = []
+    for whiskey_id in ranked:
+        if whiskey_id not in catalog:
+            continue
+        sources = [
+            catalog[source].name
+            for _, source in sorted(because[whiskey_id], reverse=True)[:2]
+            if source in catalog
+        ]
+        recommendations.append(
+            _recommendation(
+                catalog[whiskey_id],
+                confidence=round(weighted[whiskey_id] / total_interest, 2),
+                reason="Similar to " + " and ".join(sources),
+            )
+        )
+    return recommendations
+
+
+async def _trending_recommendations(
+    db: AsyncSession, exclude: set[int], limit: int
+) -> list[Recommendation]:
+    trending = [item for item in get_trending() if item.id not in exclude][:limit]
+    catalog = await get_catalog_whiskeys(db, [item.id for item in trending])
+    return [
+        _recommendation(
+            catalog[item.id],
+            confidence=0.5,
+            reason="Trending with other tasters",
+        )
+        for item in trending
+        if item.id in catalog
+    ]
+
+
+def _recommendation(
+    whiskey: WhiskeySearchResult, confidence: float, reason: str
+) -> Recommendation:
+    tags = [tag for tag in (whiskey.type, whiskey.region) if tag]
+    return Recommendation(
+        id=whiskey.id,
+        whiskey=whiskey,
+        confidence=confidence,
+        reason=reason,
+        tags=tags,
+    )
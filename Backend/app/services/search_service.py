@@ -0,0 +1,256 @@
+from typing import Any
+from typing import Optional
+
+from sqlalchemy import Select
+from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.distillery import Distillery as DistilleryModel
+from app.models.whiskey import Whiskey as WhiskeyModel
+from app.models.whiskey_rating import WhiskeyRating as WhiskeyRatingModel
+from app.schemas.search_schema import FacetCount
+from app.schemas.search_schema import WhiskeySearch
+from app.schemas.search_schema import WhiskeySearchResult
+
+# Labels the Discover page compares against
+AVAILABLE = "זמין"
+UNAVAILABLE = "לא זמין"
+
+FACET_LIMIT = 20
+
+# Whiskeys without their own region fall back to their distillery's region
+_region = func.coalesce(WhiskeyModel.region, DistilleryModel.region)
+
+_facet_columns: dict[str, Any] = {
+    "region": _region,
+    "type": WhiskeyModel.type,
+    "distillery": DistilleryModel.name,
+}
+
+
+# Whether pg_trgm is usable, checked once per process
+_fuzzy_available: Optional[bool] = None
+
+
+async def _fuzzy_search_available(db: AsyncSession) -> bool:
+    global _fuzzy_available
+    if _fuzzy_available is None:
+        if db.get_bind().dialect.name != "postgresql":
+            _fuzzy_available = False
+        else:
+            found = await db.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            )
+            _fuzzy_available = found.first() is not None
+    return _fuzzy_available
+
+
+def _name_match(query: str, fuzzy: bool) -> Any:
+    """
+    Substring match on the whiskey or distillery name; with pg_trgm also
+    trigram similarity, so typos ("lagavuln") still match. Both forms are
+    served by the GIN trigram index on whiskeys.name.
+    """
+    distillery_ids = select(DistilleryModel.id).where(
+        DistilleryModel.name.icontains(query, autoescape=True)
+    )
+    conditions = [
+        WhiskeyModel.name.icontains(query, autoescape=True),
+        WhiskeyModel.distillery_id.in_(distillery_ids),
+    ]
+    if fuzzy:
+        conditions.append(WhiskeyModel.name.op("%")(query))
+    return or_(*conditions)
+
+
+def _conditions(search: WhiskeySearch, fuzzy: bool) -> tuple[dict[str, Any], list[Any]]:
+    """
+    Split the filters into facet conditions, keyed by facet so each facet's
+    counts can leave out its own filter, and all other conditions.
+    """
+    conditions: dict[str, Any] = {}
+    other: list[Any] = []
+    if search.query:
+        other.append(_name_match(search.query, fuzzy))
+    if search.region:
+        conditions["region"] = _region == search.region
+    if search.type:
+        conditions["type"] = WhiskeyModel.type == search.type
+    if search.distillery:
+        conditions["distillery"] = DistilleryModel.name == search.distillery
+    if search.min_price is not None:
+        other.append(WhiskeyModel.price >= search.min_price)
+    if search.max_price is not None:
+        other.append(WhiskeyModel.price <= search.max_price)
+    if search.min_age is not None:
+        other.append(WhiskeyModel.age >= search.min_age)
+    if search.max_age is not None:
+        other.append(WhiskeyModel.age <= search.max_age)
+    if search.min_abv is not None:
+        other.append(WhiskeyModel.abv >= search.min_abv)
+    if search.max_abv is not None:
+        other.append(WhiskeyModel.abv <= search.max_abv)
+    if search.min_rating is not None:
+        # Read from the maintained rollup, not aggregated from the tastings
+        rated = select(WhiskeyRatingModel.whiskey_id).where(
+            WhiskeyRatingModel.tasting_count > 0,
+            WhiskeyRatingModel.rating_sum
+            >= search.min_rating * WhiskeyRatingModel.tasting_count,
+        )
+        other.append(WhiskeyModel.id.in_(rated))
+    return conditions, other
+
+
+def _where(
+    stmt: Select[Any],
+    conditions: tuple[dict[str, Any], list[Any]],
+    without: Optional[str] = None,
+) -> Select[Any]:
+    facet_conditions, other = conditions
+    return stmt.where(
+        *other,
+        *(
+            condition
+            for facet, condition in facet_conditions.items()
+            if facet != without
+        ),
+    )
+
+
+def _base(columns: list[Any]) -> Select[Any]:
+    return (
+        select(*columns)
+        .select_from(WhiskeyModel)
+        .outerjoin(WhiskeyModel.distillery_info)
+    )
+
+
+async def average_ratings(db: AsyncSession, whiskey_ids: list[int]) -> dict[int, float]:
+    """
+    Average tasting rating of the given whiskeys, across all users, read
+    from the per-whiskey rollups.
+    """
+    if not whiskey_ids:
+        return {}
+    result = await db.execute(
+        select(WhiskeyRatingModel).where(
+            WhiskeyRatingModel.whiskey_id.in_(whiskey_ids),
+            WhiskeyRatingModel.tasting_count > 0,
+        )
+    )
+    return {
+        rollup.whiskey_id: round(rollup.rating_sum / rollup.tasting_count, 1)
+        for rollup in result.scalars()
+    }
+
+
+def whiskey_result(
+    whiskey: WhiskeyModel,
+    distillery: Optional[str],
+    region: Optional[str],
+    rating: Optional[float],
+) -> WhiskeySearchResult:
+    return WhiskeySearchResult(
+        id=whiskey.id,
+        name=whiskey.name,
+        distillery=distillery,
+        region=region,
+        type=whiskey.type,
+        age=whiskey.age,
+        abv=whiskey.abv,
+        rating=rating,
+        description=whiskey.notes,
+        estimated_price=whiskey.price,
+        image_url=whiskey.image_url,
+        availability=AVAILABLE if whiskey.price is not None else UNAVAILABLE,
+    )
+
+
+async def get_catalog_whiskeys(
+    db: AsyncSession, whiskey_ids: list[int]
+) -> dict[int, WhiskeySearchResult]:
+    """
+    Catalog entries for the given ids, keyed by id.
+    """
+    if not whiskey_ids:
+        return {}
+    rows = (
+        await db.execute(
+            _base(
+                [
+                    WhiskeyModel,
+                    DistilleryModel.name.label("distillery"),
+                    _region.label("region"),
+                ]
+            ).where(WhiskeyModel.id.in_(whiskey_ids))
+        )
+    ).all()
+    ratings = await average_ratings(db, whiskey_ids)
+    return {
+        whiskey.id: whiskey_result(whiskey, distillery, region, ratings.get(whiskey.id))
+        for whiskey, distillery, region in rows
+    }
+
+
+async def search_whiskeys(
+    db: AsyncSession,
+    search: WhiskeySearch,
+    skip: int = 0,
+    limit: int = 20,
+    with_facets: bool = True,
+) -> tuple[list[WhiskeySearchResult], int, dict[str, list[FacetCount]]]:
+    """
+    Search the whiskey catalog.
+    Returns the requested page, the total number of matches and, per facet,
+    the most frequent values among matches ignoring that facet's own filter.
+    With pg_trgm, name queries also match by similarity and are ranked by it;
+    otherwise they fall back to substring matching ordered by name.
+    """
+    fuzzy = await _fuzzy_search_available(db)
+    conditions = _conditions(search, fuzzy)
+
+    page = _where(
+        _base(
+            [
+                WhiskeyModel,
+                DistilleryModel.name.label("distillery"),
+                _region.label("region"),
+            ]
+        ),
+        conditions,
+    )
+    if search.query and fuzzy:
+        similarity = func.similarity(WhiskeyModel.name, search.query)
+        page = page.order_by(similarity.desc(), WhiskeyModel.id)
+    else:
+        page = page.order_by(WhiskeyModel.name, WhiskeyModel.id)
+    rows = (await db.execute(page.offset(skip).limit(limit))).all()
+
+    total = (
+        await db.execute(_where(_base([func.count(WhiskeyModel.id)]), conditions))
+    ).scalar_one()
+
+    ratings = await average_ratings(db, [whiskey.id for whiskey, _, _ in rows])
+    results = [
+        whiskey_result(whiskey, distillery, region, ratings.get(whiskey.id))
+        for whiskey, distillery, region in rows
+    ]
+
+    facets: dict[str, list[FacetCount]] = {}
+    if with_facets:
+        for name, column in _facet_columns.items():
+            count = func.count(WhiskeyModel.id)
+            stmt = (
+                _where(_base([column, count]), conditions, without=name)
+                .where(column.is_not(None))
+                .group_by(column)
+                .order_by(count.desc(), column)
+                .limit(FACET_LIMIT)
+            )
+            facets[name] = [
+                FacetCount(value=value, count=n) for value, n in await db.execute(stmt)
+            ]
+    return results, total, facets
@@ -0,0 +1,316 @@
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import case
+from sqlalchemy import delete
+from sqlalchemy import event
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import inspect
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.database import async_session
+from app.models.tasting import Tasting as TastingModel
+from app.models.user_stats import UserStats as UserStatsModel
+from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.models.whiskey import Whiskey as WhiskeyModel
+from app.models.whiskey_rating import WhiskeyRating as WhiskeyRatingModel
+
+
+async def _collection_totals(db: AsyncSession, user_id: int) -> dict[str, Any]:
+    """
+    Aggregate the user's collection. Only owned bottles count towards the
+    value, scaled by how full they are.
+    """
+    remaining = func.coalesce(WhiskeyModel.bottle_status_percent, 100) / 100.0
+    row = (
+        await db.execute(
+            select(
+                func.count(UserWhiskeyModel.id),
+                func.count(func.distinct(WhiskeyModel.distillery_id)),
+                func.coalesce(
+                    func.sum(
+                        case(
+                            (
+                                UserWhiskeyModel.is_owned,
+                                func.coalesce(WhiskeyModel.price, 0) * remaining,
+                            ),
+                            else_=0,
+                        )
+                    ),
+                    0,
+                ),
+            )
+            .join(UserWhiskeyModel.whiskey)
+            .where(UserWhiskeyModel.user_id == user_id)
+        )
+    ).one()
+    return {
+        "total_whiskeys": row[0],
+        "unique_distilleries": row[1],
+        "collection_value": round(float(row[2]), 2),
+    }
+
+
+async def _tasting_totals(db: AsyncSession, user_id: int) -> dict[str, Any]:
+    row = (
+        await db.execute(
+            select(
+                func.count(TastingModel.id),
+                func.coalesce(func.sum(TastingModel.rating), 0),
+            ).where(TastingModel.user_id == user_id)
+        )
+    ).one()
+    return {"total_tastings": row[0], "rating_sum": int(row[1])}
+
+
+async def compute_user_stats(db: AsyncSession, user_id: int) -> UserStatsModel:
+    """
+    Build the rollup from scratch, without storing it.
+    """
+    return UserStatsModel(
+        user_id=user_id,
+        **await _collection_totals(db, user_id),
+        **await _tasting_totals(db, user_id),
+    )
+
+
+async def _backfill_user_stats(db: AsyncSession, user_id: int) -> bool:
+    """
+    Insert the rollup computed from the user's rows (which already include
+    the current transaction's changes). Returns False if a concurrent
+    transaction created the row first, so the caller can apply its delta.
+    """
+    stats = await compute_user_stats(db, user_id)
+    values = {
+        column.key: getattr(stats, column.key)
+        for column in UserStatsModel.__table__.columns
+        if column.key != "updated_date"
+    }
+    try:
+        async with db.begin_nested():
+            await db.execute(insert(UserStatsModel).values(**values))
+    except IntegrityError:
+        return False
+    return True
+
+
+async def apply_tasting_delta(
+    db: AsyncSession, user_id: int, count: int, rating: int
+) -> None:
+    """
+    Adjust the tasting counters by `count` tastings totalling `rating`.
+    The UPDATE is relative, so concurrent writers never lose increments.
+    A user without a rollup row yet gets one built from their tastings.
+    """
+    if not count and not rating:
+        return
+    stmt = (
+        update(UserStatsModel)
+        .where(UserStatsModel.user_id == user_id)
+        .values(
+            total_tastings=UserStatsModel.total_tastings + count,
+            rating_sum=UserStatsModel.rating_sum + rating,
+        )
+    )
+    result: Any = await db.execute(stmt)
+    if result.rowcount == 0 and not await _backfill_user_stats(db, user_id):
+        await db.execute(stmt)
+
+
+def _whiskey_rating_totals() -> Any:
+    return (
+        select(
+            UserWhiskeyModel.whiskey_id,
+            func.count(TastingModel.id),
+            func.coalesce(func.sum(TastingModel.rating), 0),
+        )
+        .join(UserWhiskeyModel.tastings)
+        .group_by(UserWhiskeyModel.whiskey_id)
+    )
+
+
+async def _backfill_whiskey_rating(db: AsyncSession, whiskey_id: int) -> bool:
+    """
+    Insert the whiskey's rollup computed from its tastings, which already
+    include the current transaction's changes. Returns False if a concurrent
+    transaction created the row first, so the caller can apply its delta.
+    """
+    row = (
+        await db.execute(
+            _whiskey_rating_totals().where(UserWhiskeyModel.whiskey_id == whiskey_id)
+        )
+    ).first()
+    count, rating = (row[1], int(row[2])) if row is not None else (0, 0)
+    try:
+        async with db.begin_nested():
+            await db.execute(
+                insert(WhiskeyRatingModel).values(
+                    whiskey_id=whiskey_id, tasting_count=count, rating_sum=rating
+                )
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+async def apply_whiskey_rating_deltas(
+    db: AsyncSession, deltas: Iterable[tuple[int, int, int]]
+) -> None:
+    """
+    Adjust the per-whiskey rollups by (user_whiskey_id, count, rating)
+    deltas; tastings reference the collection entry, so the whiskeys are
+    resolved with one query. Rows are updated in whiskey id order, so
+    concurrent writers tasting the same whiskeys cannot deadlock.
+    A whiskey without a rollup row yet gets one built from its tastings.
+    """
+    by_user_whiskey: dict[int, tuple[int, int]] = {}
+    for user_whiskey_id, count, rating in deltas:
+        old_count, old_rating = by_user_whiskey.get(user_whiskey_id, (0, 0))
+        by_user_whiskey[user_whiskey_id] = (old_count + count, old_rating + rating)
+    if not any(any(delta) for delta in by_user_whiskey.values()):
+        return
+    by_whiskey: dict[int, tuple[int, int]] = {}
+    for user_whiskey_id, whiskey_id in await db.execute(
+        select(UserWhiskeyModel.id, UserWhiskeyModel.whiskey_id).where(
+            UserWhiskeyModel.id.in_(by_user_whiskey)
+        )
+    ):
+        count, rating = by_user_whiskey[user_whiskey_id]
+        old_count, old_rating = by_whiskey.get(whiskey_id, (0, 0))
+        by_whiskey[whiskey_id] = (old_count + count, old_rating + rating)
+
+    for whiskey_id, (count, rating) in sorted(by_whiskey.items()):
+        if not count and not rating:
+            continue
+        stmt = (
+            update(WhiskeyRatingModel)
+            .where(WhiskeyRatingModel.whiskey_id == whiskey_id)
+            .values(
+                tasting_count=WhiskeyRatingModel.tasting_count + count,
+                rating_sum=WhiskeyRatingModel.rating_sum + rating,
+            )
+        )
+        result: Any = await db.execute(stmt)
+        if result.rowcount == 0 and not await _backfill_whiskey_rating(db, whiskey_id):
+            await db.execute(stmt)
+
+
+async def backfill_whiskey_ratings() -> None:
+    """
+    Build every whiskey's rollup from the tasting history, once, when the
+    table is still empty (i.e. it was just created). Afterwards the tasting
+    services keep it current.
+    """
+    async with async_session() as db:
+        if await db.scalar(select(WhiskeyRatingModel.whiskey_id).limit(1)):
+            return
+        try:
+            await db.execute(
+                insert(WhiskeyRatingModel).from_select(
+                    ["whiskey_id", "tasting_count", "rating_sum"],
+                    _whiskey_rating_totals(),
+                )
+            )
+            await db.commit()
+        except IntegrityError:
+            # Another process backfilled at the same time
+            await db.rollback()
+
+
+async def _lock_user_stats(db: AsyncSession, user_id: int) -> bool:
+    """
+    Lock the user's rollup row until the end of the transaction.
+    Returns False if the user has no row yet.
+    """
+    locked = await db.scalar(
+        select(UserStatsModel.user_id)
+        .where(UserStatsModel.user_id == user_id)
+        .with_for_update()
+    )
+    return locked is not None
+
+
+async def refresh_collection_stats(db: AsyncSession, user_id: int) -> None:
+    """
+    Recompute the collection columns for one user after their collection
+    changed. This aggregates a single collection through the
+    (user_id, ...) index, never the tasting history.
+    The totals are absolute, so the row is locked before aggregating: a
+    concurrent collection write for the same user then commits first and
+    its rows are counted, instead of being overwritten with stale totals.
+    """
+    if not await _lock_user_stats(db, user_id):
+        if await _backfill_user_stats(db, user_id):
+            return
+        # A concurrent transaction created the row; wait for it to finish
+        await _lock_user_stats(db, user_id)
+    totals = await _collection_totals(db, user_id)
+    await db.execute(
+        update(UserStatsModel).where(UserStatsModel.user_id == user_id).values(**totals)
+    )
+
+
+def _delete_stats_for_whiskeys(whiskey_filter: Any) -> Any:
+    affected_users = (
+        select(UserWhiskeyModel.user_id)
+        .join(UserWhiskeyModel.whiskey)
+        .where(whiskey_filter)
+    )
+    return delete(UserStatsModel).where(UserStatsModel.user_id.in_(affected_users))
+
+
+async def invalidate_stats_for_whiskeys(db: AsyncSession, whiskey_filter: Any) -> None:
+    """
+    Drop the rollups of every user collecting a whiskey matching
+    `whiskey_filter`, for catalog changes that touch many users at once.
+    They are rebuilt on the user's next write and computed on read meanwhile.
+    """
+    await db.execute(_delete_stats_for_whiskeys(whiskey_filter))
+
+
+# Catalog columns the collection rollups are computed from
+_COLLECTION_STATS_COLUMNS = ("price", "bottle_status_percent", "distillery_id")
+
+
+@event.listens_for(Session, "before_flush")
+def _invalidate_stats_for_catalog_changes(
+    session: Session, flush_context: Any, instances: Any
+) -> None:
+    """
+    A catalog whiskey whose price, fill level or distillery is changed
+    through the ORM drops its collectors' rollups in the same transaction,
+    whichever code path made the change. Bulk UPDATE statements bypass the
+    ORM and call invalidate_stats_for_whiskeys themselves.
+    """
+    changed = [
+        whiskey.id
+        for whiskey in session.dirty
+        if isinstance(whiskey, WhiskeyModel)
+        and any(
+            inspect(whiskey).attrs[column].history.has_changes()
+            for column in _COLLECTION_STATS_COLUMNS
+        )
+    ]
+    if changed:
+        session.execute(_delete_stats_for_whiskeys(WhiskeyModel.id.in_(changed)))
+
+
+async def delete_user_stats(db: AsyncSession, user_id: int) -> None:
+    await db.execute(delete(UserStatsModel).where(UserStatsModel.user_id == user_id))
+
+
+async def get_user_stats(db: AsyncSession, user_id: int) -> UserStatsModel:
+    """
+    Return the user's rollup in one primary-key lookup. Users without a row
+    yet get it computed on the fly (and stored by their next write), so this
+    stays safe on read replicas.
+    """
+    stats = await db.get(UserStatsModel, user_id)
+    if stats is None:
+        return await compute_user_stats(db, user_id)
+    return stats
@@ -1,12 +1,59 @@
+from collections.abc import Collection
+from typing import Any
 from typing import List
+from typing import Literal
 from typing import Optional
 
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
 from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.tasting import Tasting as TastingModel
+from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.models.whiskey import Whiskey as WhiskeyModel
+from app.schemas.tasting_schema import TastingBatch
 from app.schemas.tasting_schema import TastingCreate as TastingCreateSchema
+from app.schemas.tasting_schema import TastingFilters
 from app.schemas.tasting_schema import TastingUpdate as TastingUpdateSchema
+from app.services.stats_service import apply_tasting_delta
+from app.services.stats_service import apply_whiskey_rating_deltas
+from app.utils.pagination import Cursor
+from app.utils.pagination import column_sort_key
+from app.utils.pagination import paginate
+
+TastingSort = Literal["tasting_date", "created_date", "rating"]
+
+TASTING_SORT_KEYS = {
+    "tasting_date": column_sort_key(TastingModel.tasting_date),
+    "created_date": column_sort_key(TastingModel.created_date),
+    "rating": column_sort_key(TastingModel.rating),
+}
+
+
+def _tasting_conditions(
+    filters: Optional[TastingFilters], user_whiskey_ids: Optional[List[int]]
+) -> list[Any]:
+    conditions: list[Any] = []
+    if user_whiskey_ids:
+        conditions.append(TastingModel.user_whiskey_id.in_(user_whiskey_ids))
+    if filters is None:
+        return conditions
+    if filters.min_rating is not None:
+        conditions.append(TastingModel.rating >= filters.min_rating)
+    if filters.max_rating is not None:
+        conditions.append(TastingModel.rating <= filters.max_rating)
+    if filters.date_from is not None:
+        conditions.append(TastingModel.tasting_date >= filters.date_from)
+    if filters.date_to is not None:
+        conditions.append(TastingModel.tasting_date <= filters.date_to)
+    if filters.shared is not None:
+        conditions.append(TastingModel.shared == filters.shared)
+    if filters.setting is not None:
+        conditions.append(TastingModel.setting == filters.setting)
+    return conditions
 
 
 async def get_tasting(
@@ -14,32 +61,87 @@ async def get_tasting(
 ) -> Optional[TastingModel]:
     """
     Retrieve a single tasting by its ID, ensuring it belongs to the user.
-    Uses FOR UPDATE to lock the row.
+    Lock-free, safe to use on read replicas.
+    """
+    result = await db.execute(
+        select(TastingModel).where(
+            TastingModel.id == tasting_id,
+            TastingModel.user_id == user_id,
+        )
+    )
+    return result.scalars().first()
+
+
+async def get_tastings_for_update(
+    db: AsyncSession, tasting_ids: Collection[int], user_id: int
+) -> dict[int, TastingModel]:
+    """
+    Lock several of the user's tastings in one query, keyed by id.
+    Ids the user does not own are simply missing from the result.
     """
+    if not tasting_ids:
+        return {}
     result = await db.execute(
         select(TastingModel)
         .where(
-            TastingModel.id == tasting_id,
+            TastingModel.id.in_(tasting_ids),
             TastingModel.user_id == user_id,
         )
+        .order_by(TastingModel.id)  # consistent lock order avoids deadlocks
         .with_for_update()
     )
-    return result.scalars().first()
+    return {tasting.id: tasting for tasting in result.scalars()}
 
 
 async def get_tastings_by_user(
-    db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    sort: TastingSort = "tasting_date",
+    descending: bool = True,
+    filters: Optional[TastingFilters] = None,
+    user_whiskey_ids: Optional[List[int]] = None,
 ) -> List[TastingModel]:
     """
     Retrieve a list of tastings for a specific user with pagination.
+    Pass the cursor of the previous page for keyset pagination.
     """
+    stmt = select(TastingModel).where(
+        TastingModel.user_id == user_id,
+        *_tasting_conditions(filters, user_whiskey_ids),
+    )
     result = await db.execute(
-        select(TastingModel)
+        paginate(
+            stmt,
+            TASTING_SORT_KEYS[sort],
+            TastingModel.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            descending=descending,
+        )
+    )
+    return list(result.scalars().all())
+
+
+async def get_recent_tastings(
+    db: AsyncSession, user_id: int, limit: int = 3
+) -> list[tuple[TastingModel, str]]:
+    """
+    The user's latest tastings with the name of the whiskey tasted,
+    joined in the same query.
+    """
+    result = await db.execute(
+        select(TastingModel, WhiskeyModel.name)
+        .join(TastingModel.user_whiskey)
+        .join(UserWhiskeyModel.whiskey)
         .where(TastingModel.user_id == user_id)
-        .offset(skip)
+        .order_by(TastingModel.tasting_date.desc(), TastingModel.id.desc())
         .limit(limit)
     )
-    return list(result.scalars().all())
+    return list(result.tuples().all())
 
 
 async def get_tastings_by_user_whiskey(
@@ -48,18 +150,27 @@ async def get_tastings_by_user_whiskey(
     user_id: int,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    sort: TastingSort = "tasting_date",
+    descending: bool = True,
 ) -> List[TastingModel]:
     """
     Retrieve tastings for a specific user_whiskey and user.
     """
+    stmt = select(TastingModel).where(
+        TastingModel.user_whiskey_id == user_whiskey_id,
+        TastingModel.user_id == user_id,
+    )
     result = await db.execute(
-        select(TastingModel)
-        .where(
-            TastingModel.user_whiskey_id == user_whiskey_id,
-            TastingModel.user_id == user_id,
+        paginate(
+            stmt,
+            TASTING_SORT_KEYS[sort],
+            TastingModel.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            descending=descending,
         )
-        .offset(skip)
-        .limit(limit)
     )
     return list(result.scalars().all())
 
@@ -70,11 +181,18 @@ async def create_tasting(
     """
     Create a new tasting for a specific user.
     The user_whiskey_id is part of the TastingCreateSchema.
+    INSERT ... RETURNING populates the ORM object in a single round trip.
     """
-    db_tasting = TastingModel(**tasting.dict(), user_id=user_id)
-    db.add(db_tasting)
-    await db.flush()
-    await db.refresh(db_tasting)
+    result = await db.execute(
+        insert(TastingModel)
+        .values(**tasting.dict(), user_id=user_id)
+        .returning(TastingModel)
+    )
+    db_tasting = result.scalar_one()
+    await apply_tasting_delta(db, user_id, 1, db_tasting.rating)
+    await apply_whiskey_rating_deltas(
+        db, [(db_tasting.user_whiskey_id, 1, db_tasting.rating)]
+    )
     return db_tasting
 
 
@@ -86,19 +204,36 @@ async def update_tasting(
 ) -> Optional[TastingModel]:
     """
     Update an existing tasting.
+    The UPDATE itself locks the row and checks ownership, no SELECT needed.
     """
-    db_tasting = await get_tasting(
-        db, tasting_id, user_id
-    )  # Ensure user owns the tasting
-    if not db_tasting:
-        return None  # Or raise HTTPException
-
     update_data = tasting_update_data.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_tasting, key, value)
+    if not update_data:
+        return await get_tasting(db, tasting_id, user_id)
 
-    await db.flush()
-    await db.refresh(db_tasting)
+    old_rating = None
+    if "rating" in update_data:
+        # Only rating changes touch the stats; lock the row to read the old value
+        old_rating = await db.scalar(
+            select(TastingModel.rating)
+            .where(TastingModel.id == tasting_id, TastingModel.user_id == user_id)
+            .with_for_update()
+        )
+
+    result = await db.execute(
+        update(TastingModel)
+        .where(
+            TastingModel.id == tasting_id,
+            TastingModel.user_id == user_id,
+        )  # Ensure user owns the tasting
+        .values(**update_data)
+        .returning(TastingModel)
+    )
+    db_tasting = result.scalars().first()
+    if db_tasting is not None and old_rating is not None:
+        await apply_tasting_delta(db, user_id, 0, db_tasting.rating - old_rating)
+        await apply_whiskey_rating_deltas(
+            db, [(db_tasting.user_whiskey_id, 0, db_tasting.rating - old_rating)]
+        )
     return db_tasting
 
 
@@ -108,12 +243,97 @@ async def delete_tasting(
     """
     Delete a tasting.
     """
-    db_tasting = await get_tasting(
-        db, tasting_id, user_id
-    )  # Ensure user owns the tasting
-    if not db_tasting:
-        return None  # Or raise HTTPException
+    result = await db.execute(
+        delete(TastingModel)
+        .where(
+            TastingModel.id == tasting_id,
+            TastingModel.user_id == user_id,
+        )  # Ensure user owns the tasting
+        .returning(TastingModel)
+    )
+    db_tasting = result.scalars().first()
+    if db_tasting is not None:
+        await apply_tasting_delta(db, user_id, -1, -db_tasting.rating)
+        await apply_whiskey_rating_deltas(
+            db, [(db_tasting.user_whiskey_id, -1, -db_tasting.rating)]
+        )
+    return db_tasting
+
+
+async def apply_tasting_batch(
+    db: AsyncSession, batch: TastingBatch, user_id: int
+) -> Optional[tuple[list[TastingModel], list[TastingModel], list[int]]]:
+    """
+    Create, update and delete several tastings in the caller's transaction.
+    All targets are ownership-checked and locked with one query up front;
+    if any tasting (or any user_whiskey of a new tasting) is not the user's,
+    nothing is changed and None is returned.
+    Returns (created, updated, deleted ids).
+    """
+    # Repeated ids count once, for the stats as for the rows
+    deleted_ids = list(dict.fromkeys(batch.delete))
+    updated_ids = {item.id for item in batch.update}
+    target_ids = updated_ids | set(deleted_ids)
+    targets = await get_tastings_for_update(db, target_ids, user_id)
+    if len(targets) != len(target_ids):
+        return None
 
-    await db.delete(db_tasting)
+    user_whiskey_ids = {item.user_whiskey_id for item in batch.create}
+    if user_whiskey_ids:
+        owned = await db.scalar(
+            select(func.count()).where(
+                UserWhiskeyModel.id.in_(user_whiskey_ids),
+                UserWhiskeyModel.user_id == user_id,
+            )
+        )
+        if owned != len(user_whiskey_ids):
+            return None
+
+    # Net change to the stats: removed ratings out, new and edited ones in
+    count = len(batch.create) - len(deleted_ids)
+    rating = sum(item.rating for item in batch.create)
+    rating -= sum(targets[tasting_id].rating for tasting_id in deleted_ids)
+    rating -= sum(targets[tasting_id].rating for tasting_id in updated_ids)
+    # The same, per collection entry, for the per-whiskey rollups
+    whiskey_deltas = [(item.user_whiskey_id, 1, item.rating) for item in batch.create]
+    whiskey_deltas += [
+        (targets[tasting_id].user_whiskey_id, -1, -targets[tasting_id].rating)
+        for tasting_id in deleted_ids
+    ]
+    whiskey_deltas += [
+        (targets[tasting_id].user_whiskey_id, 0, -targets[tasting_id].rating)
+        for tasting_id in updated_ids
+    ]
+
+    updated = []
+    for item in batch.update:
+        tasting = targets[item.id]
+        for key, value in item.dict(exclude_unset=True, exclude={"id"}).items():
+            setattr(tasting, key, value)
+        updated.append(tasting)
+    # The ORM groups the UPDATEs by changed columns into executemany batches
     await db.flush()
-    return db_tasting
+    rating += sum(targets[tasting_id].rating for tasting_id in updated_ids)
+    whiskey_deltas += [
+        (targets[tasting_id].user_whiskey_id, 0, targets[tasting_id].rating)
+        for tasting_id in updated_ids
+    ]
+
+    if deleted_ids:
+        await db.execute(
+            delete(TastingModel).where(
+                TastingModel.id.in_(deleted_ids),
+                TastingModel.user_id == user_id,
+            )
+        )
+
+    created: list[TastingModel] = []
+    if batch.create:
+        result = await db.execute(
+            insert(TastingModel).returning(TastingModel),
+            [{**item.dict(), "user_id": user_id} for item in batch.create],
+        )
+        created = list(result.scalars().all())
+    await apply_tasting_delta(db, user_id, count, rating)
+    await apply_whiskey_rating_deltas(db, whiskey_deltas)
+    return created, updated, deleted_ids
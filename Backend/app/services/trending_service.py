@@ -0,0 +1,142 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import date
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import read_sessionmaker
+from app.models.tasting import Tasting as TastingModel
+from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.models.whiskey import Whiskey as WhiskeyModel
+from app.schemas.whiskey_schema import TrendingWhiskey
+
+TRENDING_REFRESH_INTERVAL = int(os.getenv("TRENDING_REFRESH_INTERVAL", "300"))
+TRENDING_WINDOW_DAYS = int(os.getenv("TRENDING_WINDOW_DAYS", "30"))
+TRENDING_HALF_LIFE_DAYS = float(os.getenv("TRENDING_HALF_LIFE_DAYS", "7"))
+TRENDING_SIZE = int(os.getenv("TRENDING_SIZE", "10"))
+
+
+class TrendingSnapshot:
+    """
+    The latest ranking, replaced wholesale on every refresh so readers
+    never see a half-built list.
+    """
+
+    def __init__(self) -> None:
+        self.items: list[TrendingWhiskey] = []
+        self.computed_at: Optional[datetime] = None
+
+
+snapshot = TrendingSnapshot()
+
+
+def _decay(age_days: int) -> float:
+    return float(0.5 ** (age_days / TRENDING_HALF_LIFE_DAYS))
+
+
+def _trend(current: int, previous: int) -> str:
+    """
+    Change in tastings against the previous window, e.g. "+12%".
+    """
+    if not previous:
+        return "+100%" if current else "0%"
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+async def compute_trending(
+    db: AsyncSession, today: Optional[date] = None
+) -> list[TrendingWhiskey]:
+    """
+    Rank whiskeys by recent tastings. Each tasting in the window counts
+    rating / 10, halved every TRENDING_HALF_LIFE_DAYS of age.
+
+    Tastings are aggregated per whiskey and day in SQL, over two windows
+    only (the previous one gives the trend); the decay is applied here so
+    the query stays portable across databases.
+    """
+    today = today or date.today()
+    window_start = today - timedelta(days=TRENDING_WINDOW_DAYS)
+    previous_start = window_start - timedelta(days=TRENDING_WINDOW_DAYS)
+
+    result = await db.execute(
+        select(
+            UserWhiskeyModel.whiskey_id,
+            TastingModel.tasting_date,
+            func.count(TastingModel.id),
+            func.sum(TastingModel.rating),
+        )
+        .join(TastingModel.user_whiskey)
+        .where(
+            TastingModel.tasting_date > previous_start,
+            TastingModel.tasting_date <= today,
+        )
+        .group_by(UserWhiskeyModel.whiskey_id, TastingModel.tasting_date)
+    )
+
+    scores: dict[int, float] = defaultdict(float)
+    mentions: dict[int, int] = defaultdict(int)
+    previous: dict[int, int] = defaultdict(int)
+    for whiskey_id, tasting_date, count, rating_sum in result:
+        if tasting_date > window_start:
+            age_days = (today - tasting_date).days
+            scores[whiskey_id] += _decay(age_days) * (rating_sum or 0) / 10
+            mentions[whiskey_id] += count
+        else:
+            previous[whiskey_id] += count
+
+    top = sorted(scores, key=lambda whiskey_id: (-scores[whiskey_id], whiskey_id))
+    top = top[:TRENDING_SIZE]
+    if not top:
+        return []
+    names = dict(
+        (
+            await db.execute(
+                select(WhiskeyModel.id, WhiskeyModel.name).where(
+                    WhiskeyModel.id.in_(top)
+                )
+            )
+        )
+        .tuples()
+        .all()
+    )
+    return [
+        TrendingWhiskey(
+            id=whiskey_id,
+            name=names.get(whiskey_id, ""),
+            mentions=mentions[whiskey_id],
+            trend=_trend(mentions[whiskey_id], previous[whiskey_id]),
+            score=round(scores[whiskey_id], 3),
+        )
+        for whiskey_id in top
+    ]
+
+
+async def refresh_trending() -> None:
+    async with read_sessionmaker()() as db:
+        items = await compute_trending(db)
+    snapshot.items = items
+    snapshot.computed_at = datetime.now(timezone.utc)
+
+
+async def refresh_trending_periodically(interval: int) -> None:
+    """
+    Keep the trending snapshot current. Each worker process keeps its own.
+    """
+    while True:
+        try:
+            await refresh_trending()
+        except (SQLAlchemyError, OSError) as e:
+            print(f"Could not refresh trending whiskeys: {e}")
+        await asyncio.sleep(interval)
+
+
+def get_trending() -> list[TrendingWhiskey]:
+    return snapshot.items
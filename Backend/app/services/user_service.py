@@ -1,22 +1,38 @@
+from functools import partial
+from typing import Literal
 from typing import Optional
 
+from sqlalchemy import delete
+from sqlalchemy import insert
 from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.auth import get_password_hash
-from app.auth.auth import verify_password
+from app.auth.auth import get_password_hash_async
+from app.auth.auth import verify_password_async
+from app.auth.user_cache import invalidate_user
+from app.db.database import after_commit
 from app.models.user import User as UserModel
 from app.schemas.user_schema import UserCreate as UserCreateSchema
 from app.schemas.user_schema import UserUpdate as UserUpdateSchema
+from app.services.stats_service import delete_user_stats
+from app.utils.pagination import Cursor
+from app.utils.pagination import column_sort_key
+from app.utils.pagination import paginate
+
+UserSort = Literal["created_date", "email"]
+
+USER_SORT_KEYS = {
+    "created_date": column_sort_key(UserModel.created_date),
+    "email": column_sort_key(UserModel.email),
+}
 
 
 async def get_user(db: AsyncSession, user_id: int) -> Optional[UserModel]:
     """
     Retrieve a single user by their ID.
     """
-    result = await db.execute(
-        select(UserModel).where(UserModel.id == user_id).with_for_update()
-    )
+    result = await db.execute(select(UserModel).where(UserModel.id == user_id))
     return result.scalars().first()
 
 
@@ -31,12 +47,27 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[UserModel]
 
 
 async def get_users(
-    db: AsyncSession, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    sort: UserSort = "created_date",
+    descending: bool = False,
 ) -> list[UserModel]:
     """
     Retrieve a list of users with pagination.
     """
-    result = await db.execute(select(UserModel).offset(skip).limit(limit))
+    result = await db.execute(
+        paginate(
+            select(UserModel),
+            USER_SORT_KEYS[sort],
+            UserModel.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            descending=descending,
+        )
+    )
     return list(result.scalars().all())
 
 
@@ -45,17 +76,18 @@ async def create_user(db: AsyncSession, user: UserCreateSchema) -> UserModel:
     Create a new user.
     Hashes the password before saving.
     """
-    hashed_password = get_password_hash(user.password)
-    db_user = UserModel(
-        email=user.email,
-        full_name=user.full_name,
-        hashed_password=hashed_password,
-        is_active=True,
+    hashed_password = await get_password_hash_async(user.password)
+    result = await db.execute(
+        insert(UserModel)
+        .values(
+            email=user.email,
+            full_name=user.full_name,
+            hashed_password=hashed_password,
+            is_active=True,
+        )
+        .returning(UserModel)
     )
-    db.add(db_user)
-    await db.flush()
-    await db.refresh(db_user)
-    return db_user
+    return result.scalar_one()
 
 
 async def authenticate_user(
@@ -64,7 +96,7 @@ async def authenticate_user(
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     return user
 
@@ -76,29 +108,46 @@ async def update_user(
     Update an existing user's details.
     Handles password hashing if a new password is provided.
     """
-    db_user = await get_user(db, user_id=user_id)
-    if not db_user:
-        return None
-
     update_data = user_update_data.dict(exclude_unset=True)
 
-    if "password" in update_data and update_data["password"]:
-        hashed_password = get_password_hash(update_data["password"])
-        db_user.hashed_password = hashed_password
-        del update_data["password"]
+    if "password" in update_data:
+        password = update_data.pop("password")
+        if password:
+            update_data["hashed_password"] = await get_password_hash_async(password)
 
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
+    if not update_data:
+        return await get_user(db, user_id=user_id)
 
-    await db.flush()
-    await db.refresh(db_user)
+    # Token subjects are emails, so an email change must evict the old key too
+    stale_emails = []
+    if "email" in update_data:
+        old_user = await get_user(db, user_id=user_id)
+        if old_user:
+            stale_emails.append(old_user.email)
+
+    result = await db.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(**update_data)
+        .returning(UserModel)
+    )
+    db_user = result.scalars().first()
+    if db_user:
+        # Again after the commit: a request authenticating before it would
+        # cache the old row
+        subjects = (db_user.email, *stale_emails)
+        await invalidate_user(*subjects)
+        after_commit(db, partial(invalidate_user, *subjects))
     return db_user
 
 
 async def delete_user(db: AsyncSession, user_id: int) -> Optional[UserModel]:
-    db_user = await get_user(db, user_id)
-    if not db_user:
-        return None  # Or raise an exception
-    await db.delete(db_user)
-    await db.flush()
-    return db_user
+    await delete_user_stats(db, user_id)
+    result = await db.execute(
+        delete(UserModel).where(UserModel.id == user_id).returning(UserModel)
+    )
+    db_user = result.scalars().first()
+    if db_user:
+        await invalidate_user(db_user.email)
+        after_commit(db, partial(invalidate_user, db_user.email))
+    return db_user  # None if the user does not exist
@@ -1,12 +1,100 @@
+from collections.abc import Collection
+from typing import Any
 from typing import List
+from typing import Literal
 from typing import Optional
 
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
 from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm import selectinload
 
+from app.models.distillery import Distillery as DistilleryModel
 from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
+from app.models.whiskey import Whiskey as WhiskeyModel
+from app.schemas.user_whiskey_schema import UserWhiskeyBatch
 from app.schemas.user_whiskey_schema import UserWhiskeyCreate as UserWhiskeyCreateSchema
+from app.schemas.user_whiskey_schema import UserWhiskeyFilters
 from app.schemas.user_whiskey_schema import UserWhiskeyUpdate as UserWhiskeyUpdateSchema
+from app.services.autocomplete_service import record_collection_change
+from app.services.stats_service import refresh_collection_stats
+from app.utils.pagination import Cursor
+from app.utils.pagination import SortKey
+from app.utils.pagination import column_sort_key
+from app.utils.pagination import paginate
+
+# The schemas also carry bottle details (purchase date, size, fill level),
+# which are stored on the whiskey rather than per collection entry
+_WRITABLE_COLUMNS = {column.key for column in UserWhiskeyModel.__table__.columns} - {
+    "id",
+    "user_id",
+}
+
+UserWhiskeySort = Literal["created_date", "name", "age", "abv", "price", "region"]
+
+# Whiskeys without their own region fall back to their distillery's region
+_region = func.coalesce(WhiskeyModel.region, DistilleryModel.region)
+
+
+def _whiskey_value(attribute: str, missing: Any) -> SortKey:
+    """
+    Sort on a nullable whiskey column. NULLs are mapped to `missing` in SQL and
+    in the cursor alike, so keyset comparisons never meet a NULL.
+    """
+    column = getattr(WhiskeyModel, attribute)
+
+    def value(user_whiskey: UserWhiskeyModel) -> Any:
+        found = getattr(user_whiskey.whiskey, attribute)
+        return missing if found is None else found
+
+    return SortKey(func.coalesce(column, missing), value)
+
+
+def _region_value(user_whiskey: UserWhiskeyModel) -> str:
+    whiskey = user_whiskey.whiskey
+    distillery = whiskey.distillery_info
+    return whiskey.region or (distillery.region if distillery else None) or ""
+
+
+USER_WHISKEY_SORT_KEYS = {
+    "created_date": column_sort_key(UserWhiskeyModel.created_date),
+    "name": SortKey(WhiskeyModel.name, lambda user_whiskey: user_whiskey.whiskey.name),
+    "age": _whiskey_value("age", -1),
+    "abv": _whiskey_value("abv", -1.0),
+    "price": _whiskey_value("price", -1.0),
+    "region": SortKey(func.coalesce(_region, ""), _region_value),
+}
+
+
+def _collection_conditions(filters: UserWhiskeyFilters) -> list[Any]:
+    conditions: list[Any] = []
+    if filters.region is not None:
+        conditions.append(_region == filters.region)
+    if filters.type is not None:
+        conditions.append(WhiskeyModel.type == filters.type)
+    if filters.distillery is not None:
+        conditions.append(DistilleryModel.name == filters.distillery)
+    if filters.min_age is not None:
+        conditions.append(WhiskeyModel.age >= filters.min_age)
+    if filters.max_age is not None:
+        conditions.append(WhiskeyModel.age <= filters.max_age)
+    if filters.min_abv is not None:
+        conditions.append(WhiskeyModel.abv >= filters.min_abv)
+    if filters.max_abv is not None:
+        conditions.append(WhiskeyModel.abv <= filters.max_abv)
+    if filters.min_price is not None:
+        conditions.append(WhiskeyModel.price >= filters.min_price)
+    if filters.max_price is not None:
+        conditions.append(WhiskeyModel.price <= filters.max_price)
+    if filters.is_favorite is not None:
+        conditions.append(UserWhiskeyModel.is_favorite == filters.is_favorite)
+    if filters.is_owned is not None:
+        conditions.append(UserWhiskeyModel.is_owned == filters.is_owned)
+    return conditions
 
 
 async def get_user_whiskey(
@@ -14,6 +102,7 @@ async def get_user_whiskey(
 ) -> Optional[UserWhiskeyModel]:
     """
     Retrieve a specific UserWhiskey instance by ID, ensuring it belongs to the user.
+    Lock-free, safe to use on read replicas.
     """
     result = await db.execute(
         select(UserWhiskeyModel)
@@ -21,22 +110,70 @@ async def get_user_whiskey(
             UserWhiskeyModel.id == user_whiskey_id,
             UserWhiskeyModel.user_id == user_id,
         )
-        .with_for_update()
+        .options(selectinload(UserWhiskeyModel.whiskey))
     )
     return result.scalars().first()
 
 
+async def get_user_whiskeys_for_update(
+    db: AsyncSession, user_whiskey_ids: Collection[int], user_id: int
+) -> dict[int, UserWhiskeyModel]:
+    """
+    Lock several of the user's collection entries in one query, keyed by id.
+    Ids the user does not own are simply missing from the result.
+    """
+    if not user_whiskey_ids:
+        return {}
+    result = await db.execute(
+        select(UserWhiskeyModel)
+        .where(
+            UserWhiskeyModel.id.in_(user_whiskey_ids),
+            UserWhiskeyModel.user_id == user_id,
+        )
+        .order_by(UserWhiskeyModel.id)  # consistent lock order avoids deadlocks
+        .with_for_update()
+    )
+    return {user_whiskey.id: user_whiskey for user_whiskey in result.scalars()}
+
+
 async def get_user_whiskeys(
-    db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    sort: UserWhiskeySort = "created_date",
+    descending: bool = True,
+    filters: Optional[UserWhiskeyFilters] = None,
 ) -> List[UserWhiskeyModel]:
     """
     Retrieve all UserWhiskey entries belonging to the current user.
+    Filtering and sorting run in SQL against the joined whiskey/distillery,
+    which are loaded in the same query.
     """
-    result = await db.execute(
+    stmt = (
         select(UserWhiskeyModel)
+        .join(UserWhiskeyModel.whiskey)
+        .outerjoin(WhiskeyModel.distillery_info)
         .where(UserWhiskeyModel.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
+        .options(
+            contains_eager(UserWhiskeyModel.whiskey).contains_eager(
+                WhiskeyModel.distillery_info
+            )
+        )
+    )
+    if filters is not None:
+        stmt = stmt.where(*_collection_conditions(filters))
+    result = await db.execute(
+        paginate(
+            stmt,
+            USER_WHISKEY_SORT_KEYS[sort],
+            UserWhiskeyModel.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            descending=descending,
+        )
     )
     return list(result.scalars().all())
 
@@ -47,11 +184,16 @@ async def create_user_whiskey(
     """
     Create a new UserWhiskey entry for the current user.
     """
-    db_user_whiskey = UserWhiskeyModel(**user_whiskey.dict(), user_id=user_id)
-    db.add(db_user_whiskey)
-    await db.flush()
-    await db.refresh(db_user_whiskey)
-    return db_user_whiskey
+    result = await db.execute(
+        insert(UserWhiskeyModel)
+        .values(**user_whiskey.dict(include=_WRITABLE_COLUMNS), user_id=user_id)
+        .returning(UserWhiskeyModel)
+        .options(selectinload(UserWhiskeyModel.whiskey))
+    )
+    user_whiskey = result.scalar_one()
+    await refresh_collection_stats(db, user_id)
+    record_collection_change([user_whiskey.whiskey_id], 1)
+    return user_whiskey
 
 
 async def update_user_whiskey(
@@ -63,16 +205,24 @@ async def update_user_whiskey(
     """
     Update an existing UserWhiskey entry.
     """
-    db_user_whiskey = await get_user_whiskey(db, user_whiskey_id, user_id)
-    if not db_user_whiskey:
-        return None
-
-    for key, value in update_data.dict(exclude_unset=True).items():
-        setattr(db_user_whiskey, key, value)
+    values = update_data.dict(exclude_unset=True, include=_WRITABLE_COLUMNS)
+    if not values:
+        return await get_user_whiskey(db, user_whiskey_id, user_id)
 
-    await db.flush()
-    await db.refresh(db_user_whiskey)
-    return db_user_whiskey
+    result = await db.execute(
+        update(UserWhiskeyModel)
+        .where(
+            UserWhiskeyModel.id == user_whiskey_id,
+            UserWhiskeyModel.user_id == user_id,
+        )
+        .values(**values)
+        .returning(UserWhiskeyModel)
+        .options(selectinload(UserWhiskeyModel.whiskey))
+    )
+    user_whiskey = result.scalars().first()
+    if user_whiskey is not None:
+        await refresh_collection_stats(db, user_id)
+    return user_whiskey
 
 
 async def delete_user_whiskey(
@@ -81,10 +231,68 @@ async def delete_user_whiskey(
     """
     Delete a specific UserWhiskey instance.
     """
-    db_user_whiskey = await get_user_whiskey(db, user_whiskey_id, user_id)
-    if not db_user_whiskey:
+    result = await db.execute(
+        delete(UserWhiskeyModel)
+        .where(
+            UserWhiskeyModel.id == user_whiskey_id,
+            UserWhiskeyModel.user_id == user_id,
+        )
+        .returning(UserWhiskeyModel)
+        .options(selectinload(UserWhiskeyModel.whiskey))
+    )
+    user_whiskey = result.scalars().first()
+    if user_whiskey is not None:
+        await refresh_collection_stats(db, user_id)
+        record_collection_change([user_whiskey.whiskey_id], -1)
+    return user_whiskey
+
+
+async def apply_user_whiskey_batch(
+    db: AsyncSession, batch: UserWhiskeyBatch, user_id: int
+) -> Optional[tuple[list[UserWhiskeyModel], list[int]]]:
+    """
+    Update and delete several collection entries in the caller's transaction.
+    All targets are ownership-checked and locked with one query up front;
+    if any is not the user's, nothing is changed and None is returned.
+    Returns (updated, deleted ids).
+    """
+    # Repeated ids count once, for the popularity as for the rows
+    deleted_ids = list(dict.fromkeys(batch.delete))
+    target_ids = {item.id for item in batch.update} | set(deleted_ids)
+    targets = await get_user_whiskeys_for_update(db, target_ids, user_id)
+    if len(targets) != len(target_ids):
         return None
 
-    await db.delete(db_user_whiskey)
+    for item in batch.update:
+        user_whiskey = targets[item.id]
+        values = item.dict(exclude_unset=True, include=_WRITABLE_COLUMNS)
+        for key, value in values.items():
+            setattr(user_whiskey, key, value)
     await db.flush()
-    return db_user_whiskey
+
+    if deleted_ids:
+        await db.execute(
+            delete(UserWhiskeyModel).where(
+                UserWhiskeyModel.id.in_(deleted_ids),
+                UserWhiskeyModel.user_id == user_id,
+            )
+        )
+
+    updated: list[UserWhiskeyModel] = []
+    if batch.update:
+        # Reload in one query: updated_date is set by the database and the
+        # response needs the whiskey
+        result = await db.execute(
+            select(UserWhiskeyModel)
+            .where(UserWhiskeyModel.id.in_({item.id for item in batch.update}))
+            .options(selectinload(UserWhiskeyModel.whiskey))
+            .order_by(UserWhiskeyModel.id)
+            .execution_options(populate_existing=True)
+        )
+        updated = list(result.scalars().all())
+    if target_ids:
+        await refresh_collection_stats(db, user_id)
+    record_collection_change(
+        [targets[user_whiskey_id].whiskey_id for user_whiskey_id in deleted_ids], -1
+    )
+    return updated, deleted_ids
@@ -1,7 +1,10 @@
 from typing import List
 from typing import Optional
 
+from sqlalchemy import delete
+from sqlalchemy import insert
 from sqlalchemy import select
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_whiskey import UserWhiskey as UserWhiskeyModel
@@ -14,14 +17,13 @@ async def get_user_whiskey(
 ) -> Optional[UserWhiskeyModel]:
     """
     Retrieve a single UserWhiskey record by ID, ensuring it belongs to the user.
+    Lock-free, safe to use on read replicas.
     """
     result = await db.execute(
-        select(UserWhiskeyModel)
-        .where(
+        select(UserWhiskeyModel).where(
             UserWhiskeyModel.id == user_whiskey_id,
             UserWhiskeyModel.user_id == user_id,
         )
-        .with_for_update()
     )
     return result.scalars().first()
 
@@ -47,11 +49,12 @@ async def create_user_whiskey(
     """
     Create a new UserWhiskey instance for a specific user.
     """
-    db_whiskey = UserWhiskeyModel(**whiskey.dict(), user_id=user_id)
-    db.add(db_whiskey)
-    await db.flush()
-    await db.refresh(db_whiskey)
-    return db_whiskey
+    result = await db.execute(
+        insert(UserWhiskeyModel)
+        .values(**whiskey.dict(), user_id=user_id)
+        .returning(UserWhiskeyModel)
+    )
+    return result.scalar_one()
 
 
 async def update_user_whiskey(
@@ -63,17 +66,20 @@ async def update_user_whiskey(
     """
     Update an existing UserWhiskey record.
     """
-    db_whiskey = await get_user_whiskey(db, user_whiskey_id, user_id)
-    if not db_whiskey:
-        return None  # Or raise HTTPException
-
     update_data = whiskey_update_data.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_whiskey, key, value)
+    if not update_data:
+        return await get_user_whiskey(db, user_whiskey_id, user_id)
 
-    await db.flush()
-    await db.refresh(db_whiskey)
-    return db_whiskey
+    result = await db.execute(
+        update(UserWhiskeyModel)
+        .where(
+            UserWhiskeyModel.id == user_whiskey_id,
+            UserWhiskeyModel.user_id == user_id,
+        )
+        .values(**update_data)
+        .returning(UserWhiskeyModel)
+    )
+    return result.scalars().first()  # None if missing or not owned
 
 
 async def delete_user_whiskey(
@@ -82,10 +88,12 @@ async def delete_user_whiskey(
     """
     Delete a UserWhiskey record.
     """
-    db_whiskey = await get_user_whiskey(db, user_whiskey_id, user_id)
-    if not db_whiskey:
-        return None  # Or raise HTTPException
-
-    await db.delete(db_whiskey)
-    await db.flush()
-    return db_whiskey
+    result = await db.execute(
+        delete(UserWhiskeyModel)
+        .where(
+            UserWhiskeyModel.id == user_whiskey_id,
+            UserWhiskeyModel.user_id == user_id,
+        )
+        .returning(UserWhiskeyModel)
+    )
+    return result.scalars().first()  # None if missing or not owned
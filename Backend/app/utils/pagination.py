@@ -0,0 +1,192 @@
+import base64
+import binascii
+import json
+import math
+from collections.abc import Callable
+from collections.abc import Sequence
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any
+from typing import Literal
+from typing import NamedTuple
+from typing import Optional
+from typing import TypeVar
+
+from fastapi import HTTPException
+from fastapi import Response
+from fastapi import status
+from sqlalchemy import Select
+from sqlalchemy import tuple_
+
+S = TypeVar("S", bound=Select[Any])
+
+SortOrder = Literal["asc", "desc"]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class SortKey(NamedTuple):
+    """
+    A sortable SQL expression plus a function reading the same value from a
+    loaded row, used to build the cursor for the next page.
+    """
+
+    column: Any
+    value: Callable[[Any], Any]
+
+
+def column_sort_key(column: Any) -> SortKey:
+    return SortKey(column, attrgetter(column.key))
+
+
+class Cursor(NamedTuple):
+    sort: str
+    value: Any
+    id: int
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    """
+    Opaque cursor holding the sort key and id of the last row of a page.
+    """
+    raw = json.dumps([sort, _dump_value(value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Raises ValueError for cursors this module did not produce.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("malformed cursor") from e
+    if not isinstance(sort, str) or not isinstance(row_id, int):
+        raise ValueError("malformed cursor")
+    try:
+        return Cursor(sort, _load_value(value), row_id)
+    except TypeError as e:
+        raise ValueError("malformed cursor") from e
+
+
+def parse_cursor(cursor: Optional[str], sort: str) -> Optional[Cursor]:
+    """
+    Decode a cursor query parameter, answering 400 if it is invalid or was
+    issued for a different sort order.
+    """
+    if cursor is None:
+        return None
+    try:
+        decoded = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    if decoded.sort != sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort",
+        )
+    return decoded
+
+
+# Integers beyond this fail in the database instead of comparing
+_MAX_INTEGER = 2**63 - 1
+
+
+def _matches_sort_key(value: Any, sort_key: SortKey) -> bool:
+    """
+    Whether a decoded cursor value can be compared with the sort column.
+    """
+    if value is None:
+        return True
+    try:
+        expected = sort_key.column.type.python_type
+    except NotImplementedError:
+        return True
+    if expected in (int, float, Decimal):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return math.isfinite(value) and abs(value) <= _MAX_INTEGER
+    if expected is datetime:
+        return isinstance(value, datetime)
+    if expected is date:
+        return isinstance(value, date) and not isinstance(value, datetime)
+    return isinstance(value, expected)
+
+
+def paginate(
+    stmt: S,
+    sort_key: SortKey,
+    id_column: Any,
+    cursor: Optional[Cursor] = None,
+    skip: int = 0,
+    limit: int = 100,
+    descending: bool = False,
+) -> S:
+    """
+    Order by (sort key, id) so pages are stable, then either seek past the
+    cursor (keyset pagination, cost independent of depth) or fall back to
+    the legacy OFFSET when no cursor is given.
+    A cursor whose value doesn't fit the sort column is answered with 400.
+    """
+    if cursor is not None:
+        if (
+            not _matches_sort_key(cursor.value, sort_key)
+            or isinstance(cursor.id, bool)
+            or not 0 <= cursor.id <= _MAX_INTEGER
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        position = tuple_(sort_key.column, id_column)
+        after = tuple_(cursor.value, cursor.id)
+        stmt = stmt.where(position < after if descending else position > after)
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    if descending:
+        stmt = stmt.order_by(sort_key.column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_key.column.asc(), id_column.asc())
+    return stmt.limit(limit)
+
+
+def set_next_cursor(
+    response: Response,
+    rows: Sequence[Any],
+    limit: int,
+    sort: str,
+    sort_key: SortKey,
+) -> None:
+    """
+    Expose the cursor for the following page in the X-Next-Cursor header,
+    keeping list responses backwards compatible.
+    """
+    if not rows or len(rows) < limit:
+        return
+    last = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+        sort, sort_key.value(last), last.id
+    )
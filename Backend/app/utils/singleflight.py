@@ -0,0 +1,44 @@
+import asyncio
+from collections.abc import Callable
+from collections.abc import Coroutine
+from collections.abc import Hashable
+from typing import Any
+from typing import Generic
+from typing import TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesce concurrent calls with the same key: the first caller starts
+    the call, later callers await the same task until it finishes, and all
+    of them get its result or exception.
+    Each caller awaits through asyncio.shield, so a cancelled caller (e.g. a
+    client that disconnected) never cancels the call for the others. The
+    call runs to completion even if every caller went away.
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, asyncio.Task[V]] = {}
+
+    async def do(self, key: K, func: Callable[[], Coroutine[Any, Any, V]]) -> V:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.create_task(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: K, task: asyncio.Task[V]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so a call whose callers all went away
+        # isn't reported as "exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._calls)
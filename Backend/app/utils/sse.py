@@ -0,0 +1,19 @@
+from collections.abc import AsyncIterable
+
+from fastapi.responses import StreamingResponse
+
+# Keep proxies (nginx) from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: str) -> str:
+    """
+    One Server-Sent Events message; `data` must be a single line (e.g. JSON).
+    """
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def sse_response(events: AsyncIterable[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events, media_type="text/event-stream", headers=SSE_HEADERS
+    )
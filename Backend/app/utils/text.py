@@ -0,0 +1,19 @@
+import unicodedata
+
+# Quotes, apostrophes and Hebrew geresh/gershayim vanish ("Daniel's" is
+# typed "daniels", "ג'יימסון" as "גיימסון"); other punctuation splits words
+_DROPPED = set("'\"`’‘׳״")
+
+
+def normalize(text: str) -> str:
+    """
+    Search form of a name: diacritics and Hebrew niqqud removed, casefolded,
+    punctuation dropped or turned into spaces, whitespace collapsed.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    characters = [
+        character if character.isalnum() else " "
+        for character in decomposed
+        if not unicodedata.combining(character) and character not in _DROPPED
+    ]
+    return " ".join("".join(characters).casefold().split())
@@ -0,0 +1,113 @@
+"""
+Local stand-in for the OpenAI chat completions API, for development and
+tests without network access or an API key.
+
+    uvicorn --app-dir scripts ai_stub_server:app --port 8001
+    OPENAI_BASE_URL=http://localhost:8001/v1 uvicorn app.main:app
+
+STUB_LATENCY adds a delay in seconds to every response and
+STUB_FAILURE_RATE (0-1) answers that share of calls with a 503, to
+exercise timeouts and retries. Streamed requests ("stream": true) get the
+answer in small chunks, STUB_TOKEN_DELAY seconds apart.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
+
+STUB_LATENCY = float(os.getenv("STUB_LATENCY", "0"))
+STUB_FAILURE_RATE = float(os.getenv("STUB_FAILURE_RATE", "0"))
+STUB_TOKEN_DELAY = float(os.getenv("STUB_TOKEN_DELAY", "0.02"))
+STUB_CHUNK_SIZE = 8
+
+WHISKEY_INFO = (
+    "מזקקה: Lagavulin\n"
+    "אזור: Islay\n"
+    "מדינה: סקוטלנד\n"
+    "אף: עשן כבול, יוד\n"
+    "חיך: מתיקות, מלח ים\n"
+    "סיומת: ארוכה ומעושנת\n"
+    "עובדות מעניינות:\n"
+    "- המזקקה פועלת מאז 1816\n"
+    "- מיושן 16 שנה בחביות אלון\n"
+)
+
+COLLECTION_ANALYSIS = {
+    "taste_preferences": "העדפה לוויסקי מעושן מאיילה",
+    "recommendations": [
+        {"name": "Ardbeg Uigeadail", "reason": "עשן עשיר עם מתיקות שרי"},
+        {"name": "Laphroaig 10", "reason": "כבול ויוד"},
+        {"name": "Talisker 10", "reason": "מלח ים ופלפל"},
+    ],
+    "exploration_suggestions": "כדאי לנסות ויסקי מקמפבלטאון",
+}
+
+app = FastAPI(title="AI stub")
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request) -> Response:
+    payload: dict[str, Any] = await request.json()
+    if STUB_LATENCY:
+        await asyncio.sleep(STUB_LATENCY)
+    if random.random() < STUB_FAILURE_RATE:
+        return JSONResponse(
+            status_code=503,
+            content={"error": {"message": "stub failure"}},
+            headers={"Retry-After": "0"},
+        )
+
+    if payload.get("response_format", {}).get("type") == "json_object":
+        content = json.dumps(COLLECTION_ANALYSIS, ensure_ascii=False)
+    else:
+        content = WHISKEY_INFO
+    if payload.get("stream"):
+        return StreamingResponse(
+            _stream(content, payload.get("model", "stub")),
+            media_type="text/event-stream",
+        )
+    return JSONResponse(
+        content={
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+    )
+
+
+async def _stream(content: str, model: str) -> AsyncIterator[str]:
+    for start in range(0, len(content), STUB_CHUNK_SIZE):
+        chunk = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": content[start : start + STUB_CHUNK_SIZE]},
+                    "finish_reason": None,
+                }
+            ],
+        }
+        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+        await asyncio.sleep(STUB_TOKEN_DELAY)
+    yield "data: [DONE]\n\n"
@@ -0,0 +1,100 @@
+"""
+GET throughput on one hot row, with and without a concurrent writer, to
+check that reads never queue behind row locks.
+
+    python scripts/bench_hot_row.py http://localhost:8000 \\
+        /api/tastings/1 --token "$TOKEN" --write '{"notes": "bench"}'
+
+Runs the GET with 1 client, then with --clients clients, each for
+--seconds; with --write, one more client keeps PUTting that body to the
+same path meanwhile. Lock-free reads scale with the client count and
+keep their latency while the row is being written; run it against
+PostgreSQL, SQLite has no row locks.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any
+from typing import Optional
+
+import httpx
+
+
+async def _reader(
+    client: httpx.AsyncClient, path: str, deadline: float, latencies: list[float]
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def _writer(
+    client: httpx.AsyncClient, path: str, body: dict[str, Any], deadline: float
+) -> int:
+    writes = 0
+    while time.perf_counter() < deadline:
+        response = await client.put(path, json=body)
+        response.raise_for_status()
+        writes += 1
+    return writes
+
+
+async def run(
+    base_url: str,
+    path: str,
+    token: Optional[str],
+    clients: int,
+    seconds: float,
+    write: Optional[dict[str, Any]],
+) -> dict[str, Any]:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=clients + 1)
+    async with httpx.AsyncClient(
+        base_url=base_url, headers=headers, limits=limits, timeout=30
+    ) as client:
+        latencies: list[float] = []
+        deadline = time.perf_counter() + seconds
+        tasks = [_reader(client, path, deadline, latencies) for _ in range(clients)]
+        if write is not None:
+            results = await asyncio.gather(
+                _writer(client, path, write, deadline), *tasks
+            )
+            writes = results[0]
+        else:
+            await asyncio.gather(*tasks)
+            writes = 0
+    latencies.sort()
+    return {
+        "clients": clients,
+        "reads_per_s": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+        "writes": writes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("base_url")
+    parser.add_argument("path", help="a single-row GET, e.g. /api/tastings/1")
+    parser.add_argument("--token", help="bearer token of the row's owner")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write", help="JSON body to PUT to the same path")
+    args = parser.parse_args()
+    write = json.loads(args.write) if args.write else None
+
+    for clients in (1, args.clients):
+        result = asyncio.run(
+            run(args.base_url, args.path, args.token, clients, args.seconds, write)
+        )
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
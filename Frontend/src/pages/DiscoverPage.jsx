@@ -32,9 +32,11 @@ import { useAuth } from '../contexts/AuthContext'; // Ensure correct path
 // These functions would make actual HTTP requests to your backend
 const getPersonalizedRecommendationsApi = async (userId, preferences = {}) => {
   try {
-    // Replace with your actual backend API endpoint
+    // Recommendations are for the logged-in user, identified by the token
+    const token = localStorage.getItem('authToken');
     const response = await fetch(
       `/api/recommendations/personalized?userId=${userId}&${new URLSearchParams(preferences)}`,
+      { headers: { Authorization: `Bearer ${token}` } },
     );
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);